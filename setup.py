@@ -17,12 +17,10 @@ setup(
         "Intended Audience :: Developers",
         "Topic :: Software Development :: Documentation",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.8",
-        "Programming Language :: Python :: 3.9",
         "Programming Language :: Python :: 3.10",
         "Programming Language :: Python :: 3.11",
     ],
-    python_requires=">=3.8",
+    python_requires=">=3.10",
     install_requires=[
         "openai>=1.0.0",
         "anthropic>=0.7.0",
@@ -37,6 +35,12 @@ setup(
         "pyyaml>=6.0",
         "pygments>=2.17.0",
     ],
+    extras_require={
+        "dev": [
+            "pytest>=7.0",
+            "pytest-xdist>=3.0",
+        ],
+    },
     entry_points={
         "console_scripts": [
             "book-creator=book_creator.cli:main",
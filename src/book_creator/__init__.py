@@ -10,28 +10,40 @@ Supports two modes of operation:
 2. Agentic-First Mode - autonomous book generation from a single prompt
 """
 
+from importlib import import_module
+
 __version__ = "0.1.0"
 
-from .models.book import Book, Chapter, Section
-from .models.agentic import (
-    LifecycleState,
-    ComplexityLevel,
-    UserPrompt,
-    BookBlueprint,
-    ChapterBlueprint,
-    AgenticState
-)
-from .generators.content_generator import ContentGenerator
-from .generators.outline_generator import OutlineGenerator
-from .generators.code_generator import CodeGenerator
-from .editors.grammar_checker import GrammarChecker
-from .editors.content_improver import ContentImprover
-from .editors.book_editor import BookEditor
-from .formatters.pdf_formatter import PDFFormatter
-from .formatters.pandoc_pdf_formatter import PandocPDFFormatter
-from .formatters.epub_formatter import EPUBFormatter
-from .formatters.html_formatter import HTMLFormatter
-from .agentic import AgenticBookGenerator, generate_book_from_prompt
+# Public names resolved on first access (PEP 562); importing the package
+# no longer pays for every generator, editor, and formatter up front
+_EXPORTS = {
+    # Book models
+    "Book": ".models.book",
+    "Chapter": ".models.book",
+    "Section": ".models.book",
+    # Agentic-First Mode
+    "AgenticBookGenerator": ".agentic",
+    "generate_book_from_prompt": ".agentic",
+    "LifecycleState": ".models.agentic",
+    "ComplexityLevel": ".models.agentic",
+    "UserPrompt": ".models.agentic",
+    "BookBlueprint": ".models.agentic",
+    "ChapterBlueprint": ".models.agentic",
+    "AgenticState": ".models.agentic",
+    # Generators
+    "ContentGenerator": ".generators.content_generator",
+    "OutlineGenerator": ".generators.outline_generator",
+    "CodeGenerator": ".generators.code_generator",
+    # Editors
+    "GrammarChecker": ".editors.grammar_checker",
+    "ContentImprover": ".editors.content_improver",
+    "BookEditor": ".editors.book_editor",
+    # Formatters
+    "PDFFormatter": ".formatters.pdf_formatter",
+    "PandocPDFFormatter": ".formatters.pandoc_pdf_formatter",
+    "EPUBFormatter": ".formatters.epub_formatter",
+    "HTMLFormatter": ".formatters.html_formatter",
+}
 
 __all__ = [
     # Book models
@@ -61,3 +73,17 @@ __all__ = [
     "EPUBFormatter",
     "HTMLFormatter",
 ]
+
+
+def __getattr__(name):
+    try:
+        module = import_module(_EXPORTS[name], __name__)
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -2,9 +2,12 @@
 Command-line interface for the book creator tool
 """
 
+import asyncio
 import click
 import os
 
+from itertools import islice
+
 from .models.book import Book
 from .generators.outline_generator import OutlineGenerator
 from .generators.content_generator import ContentGenerator
@@ -20,6 +23,20 @@ from .formatters.markdown_formatter import MarkdownFormatter
 from .utils.llm_client import LLMClient, LLMConfig, LLMProvider
 
 
+# Single shared Choice so the provider list is defined (and parsed) once
+PROVIDER_CHOICES = click.Choice(
+    ['openai', 'anthropic', 'google', 'cohere', 'mistral', 'huggingface', 'ollama']
+)
+
+
+def llm_options(f):
+    """Attach the shared --provider option to a command"""
+    return click.option(
+        '--provider', '-p', type=PROVIDER_CHOICES, default='openai',
+        help='LLM provider'
+    )(f)
+
+
 # Helper function to map string provider names to enum values
 def get_provider_enum(provider_str: str) -> LLMProvider:
     """Convert provider string to LLMProvider enum"""
@@ -35,6 +52,25 @@ def get_provider_enum(provider_str: str) -> LLMProvider:
     return provider_map.get(provider_str, LLMProvider.OPENAI)
 
 
+def get_llm_client(provider: str) -> LLMClient:
+    """
+    Return the shared LLMClient for a provider, creating it on first use
+
+    Clients are cached on the root Click context so commands invoked in the
+    same process reuse one client (and its underlying HTTP session) instead
+    of rebuilding it per call.
+    """
+    root = click.get_current_context().find_root()
+    if root.obj is None:
+        root.obj = {}
+
+    client = root.obj.get(provider)
+    if client is None:
+        client = LLMClient(LLMConfig(provider=get_provider_enum(provider)))
+        root.obj[provider] = client
+    return client
+
+
 @click.group()
 @click.version_option(version='0.1.0')
 def main():
@@ -51,15 +87,13 @@ def main():
 @click.option('--language', '-l', default='Python', help='Programming language')
 @click.option('--audience', '-a', default='intermediate developers', help='Target audience')
 @click.option('--output', '-o', default='book.json', help='Output file path')
-@click.option('--provider', '-p', type=click.Choice(['openai', 'anthropic', 'google', 'cohere', 'mistral', 'huggingface', 'ollama']), default='openai', help='LLM provider')
+@llm_options
 def create(topic, chapters, language, audience, output, provider):
     """Create a new book outline"""
     click.echo(f"Creating book outline for: {topic}")
     
     # Configure LLM
-    llm_provider = get_provider_enum(provider)
-    llm_config = LLMConfig(provider=llm_provider)
-    llm_client = LLMClient(llm_config)
+    llm_client = get_llm_client(provider)
     
     # Generate outline
     generator = OutlineGenerator(llm_client)
@@ -77,77 +111,107 @@ def create(topic, chapters, language, audience, output, provider):
     click.echo(f"  Chapters: {len(book.chapters)}")
 
 
+def _run_with_progress(tasks, label):
+    """Run async tasks concurrently, updating a progress bar as each finishes"""
+    async def _runner():
+        with click.progressbar(length=len(tasks), label=label) as bar:
+            for future in asyncio.as_completed(tasks):
+                await future
+                bar.update(1)
+
+    asyncio.run(_runner())
+
+
 @main.command()
 @click.option('--input', '-i', required=True, help='Input book file (JSON)')
 @click.option('--chapter', '-c', type=int, help='Chapter number to generate (0 for all)')
 @click.option('--output', '-o', help='Output file path')
-@click.option('--provider', '-p', type=click.Choice(['openai', 'anthropic', 'google', 'cohere', 'mistral', 'huggingface', 'ollama']), default='openai', help='LLM provider')
-def generate(input, chapter, output, provider):
+@click.option('--concurrency', default=5, help='Maximum parallel LLM requests')
+@llm_options
+def generate(input, chapter, output, concurrency, provider):
     """Generate content for book chapters"""
-    
+
     # Load book
     book = Book.load(input)
     click.echo(f"Loaded book: {book.title}")
-    
+
     # Configure LLM
-    llm_provider = get_provider_enum(provider)
-    llm_config = LLMConfig(provider=llm_provider)
-    llm_client = LLMClient(llm_config)
-    
+    llm_client = get_llm_client(provider)
+
     generator = ContentGenerator(llm_client)
     code_gen = CodeGenerator(llm_client)
-    
+
+    # LLM calls are network-bound, so independent chapters/sections are
+    # dispatched concurrently through a semaphore-bounded thread pool.
+    semaphore = asyncio.Semaphore(concurrency)
+
+    # Sections often share titles across chapters ("Introduction",
+    # "Summary", ...); memoize examples per title so duplicates reuse the
+    # same in-flight or finished task instead of repeating the LLM call
+    example_tasks = {}
+
+    async def _generate_example(title):
+        async with semaphore:
+            return await asyncio.to_thread(
+                code_gen.generate_code_with_explanation,
+                title,
+                language=book.programming_language
+            )
+
+    async def _add_code_example(section):
+        task = example_tasks.get(section.title)
+        if task is None:
+            task = asyncio.ensure_future(_generate_example(section.title))
+            example_tasks[section.title] = task
+        example = await task
+        section.add_code_example(
+            example['code'],
+            example['language'],
+            example['explanation']
+        )
+
+    async def _gen_chapter(chap):
+        async with semaphore:
+            await asyncio.to_thread(
+                generator.generate_complete_chapter,
+                chap,
+                programming_language=book.programming_language,
+                target_audience=book.target_audience
+            )
+
+        # Add code examples (limit to first 2 sections per chapter)
+        await asyncio.gather(
+            *[_add_code_example(s) for s in islice(chap.sections, 2)]
+        )
+
     if chapter and chapter > 0:
         # Generate single chapter
         chap = book.get_chapter(chapter)
         if not chap:
             click.echo(f"✗ Chapter {chapter} not found", err=True)
             return
-        
+
         click.echo(f"Generating content for Chapter {chapter}: {chap.title}")
         generator.generate_complete_chapter(
             chap,
             programming_language=book.programming_language,
             target_audience=book.target_audience
         )
-        
-        # Add code examples to sections
-        for section in chap.sections:
-            click.echo(f"  - Generating code examples for: {section.title}")
-            example = code_gen.generate_code_with_explanation(
-                section.title,
-                language=book.programming_language
-            )
-            section.add_code_example(
-                example['code'],
-                example['language'],
-                example['explanation']
-            )
-        
+
+        # Add code examples to all sections in parallel
+        _run_with_progress(
+            [_add_code_example(s) for s in chap.sections],
+            label='Generating code examples'
+        )
+
         click.echo(f"✓ Chapter {chapter} content generated")
     else:
-        # Generate all chapters
-        for chap in book.chapters:
-            click.echo(f"Generating Chapter {chap.number}: {chap.title}")
-            generator.generate_complete_chapter(
-                chap,
-                programming_language=book.programming_language,
-                target_audience=book.target_audience
-            )
-            
-            # Add code examples
-            for section in chap.sections[:2]:  # Limit to first 2 sections per chapter
-                click.echo(f"  - Generating code for: {section.title}")
-                example = code_gen.generate_code_with_explanation(
-                    section.title,
-                    language=book.programming_language
-                )
-                section.add_code_example(
-                    example['code'],
-                    example['language'],
-                    example['explanation']
-                )
-        
+        # Generate all chapters in parallel
+        _run_with_progress(
+            [_gen_chapter(c) for c in book.chapters],
+            label='Generating chapters'
+        )
+
         click.echo(f"✓ All chapters generated")
     
     # Save updated book
@@ -165,44 +229,46 @@ def generate(input, chapter, output, provider):
 @click.option('--strict', is_flag=True, help='Strict Markdown validation for pdf-pandoc')
 def export(input, format, output, theme, strict):
     """Export book to various formats"""
-    
-    # Load book
-    book = Book.load(input)
-    click.echo(f"Loaded book: {book.title}")
-    
+
     # Determine output path
     if not output:
         base_name = os.path.splitext(input)[0]
         extensions = {'html': '.html', 'pdf': '.pdf', 'epub': '.epub', 'markdown': '.md', 'pdf-pandoc': '.pdf'}
         output = base_name + extensions[format]
-    
-    # Export based on format
+
+    # Export based on format. HTML and Markdown render chapter-by-chapter
+    # straight from the JSON file; the PDF/EPUB formatters need the full
+    # book in memory for their layout passes.
     click.echo(f"Exporting to {format.upper()}...")
-    
+
     if format == 'html':
         formatter = HTMLFormatter()
-        formatter.format(book, output)
-    elif format == 'pdf':
-        formatter = PDFFormatter()
-        formatter.format(book, output)
-    elif format == 'pdf-pandoc':
-        try:
-            formatter = PandocPDFFormatter()
-            click.echo(f"Using Pandoc with {theme} theme for syntax highlighting")
-            formatter.format(book, output, strict_validation=strict, theme=theme)
-        except RuntimeError as e:
-            click.echo(f"✗ {str(e)}", err=True)
-            return
-        except ValueError as e:
-            click.echo(f"✗ Markdown validation error:\n{str(e)}", err=True)
-            return
-    elif format == 'epub':
-        formatter = EPUBFormatter()
-        formatter.format(book, output)
+        formatter.format_streaming(input, output)
     elif format == 'markdown':
         formatter = MarkdownFormatter()
-        formatter.format(book, output)
-    
+        formatter.format_streaming(input, output)
+    else:
+        book = Book.load(input)
+        click.echo(f"Loaded book: {book.title}")
+
+        if format == 'pdf':
+            formatter = PDFFormatter()
+            formatter.format(book, output)
+        elif format == 'pdf-pandoc':
+            try:
+                formatter = PandocPDFFormatter()
+                click.echo(f"Using Pandoc with {theme} theme for syntax highlighting")
+                formatter.format(book, output, strict_validation=strict, theme=theme)
+            except RuntimeError as e:
+                click.echo(f"✗ {str(e)}", err=True)
+                return
+            except ValueError as e:
+                click.echo(f"✗ Markdown validation error:\n{str(e)}", err=True)
+                return
+        elif format == 'epub':
+            formatter = EPUBFormatter()
+            formatter.format(book, output)
+
     click.echo(f"✓ Book exported to: {output}")
 
 
@@ -210,7 +276,7 @@ def export(input, format, output, theme, strict):
 @click.option('--input', '-i', required=True, help='Input book file (JSON)')
 @click.option('--chapter', '-c', type=int, help='Chapter number to check')
 @click.option('--fix', is_flag=True, help='Automatically fix issues')
-@click.option('--provider', '-p', type=click.Choice(['openai', 'anthropic', 'google', 'cohere', 'mistral', 'huggingface', 'ollama']), default='openai', help='LLM provider')
+@llm_options
 def check(input, chapter, fix, provider):
     """Check grammar and style"""
     
@@ -219,9 +285,7 @@ def check(input, chapter, fix, provider):
     click.echo(f"Checking book: {book.title}")
     
     # Configure LLM
-    llm_provider = get_provider_enum(provider)
-    llm_config = LLMConfig(provider=llm_provider)
-    llm_client = LLMClient(llm_config)
+    llm_client = get_llm_client(provider)
     
     checker = GrammarChecker(llm_client)
     
@@ -230,33 +294,18 @@ def check(input, chapter, fix, provider):
     for chap in chapters_to_check:
         if not chap:
             continue
-            
+
         click.echo(f"\nChapter {chap.number}: {chap.title}")
-        
-        # Check introduction
-        if chap.introduction:
-            result = checker.check_grammar(chap.introduction)
-            if result['issues']:
-                click.echo(f"  Introduction - Issues found:")
-                for issue in result['issues']:
+
+        # Check introduction and sections in one batched call per chapter
+        for entry in checker.check_and_fix_chapter(chap, fix=fix):
+            if entry['issues']:
+                click.echo(f"  {entry['title']} - Issues found:")
+                for issue in entry['issues']:
                     click.echo(f"    • {issue}")
-                
-                if fix:
-                    chap.introduction = checker.fix_grammar(chap.introduction)
-                    click.echo(f"  ✓ Introduction fixed")
-        
-        # Check sections
-        for section in chap.sections:
-            if section.content:
-                result = checker.check_grammar(section.content)
-                if result['issues']:
-                    click.echo(f"  {section.title} - Issues found:")
-                    for issue in result['issues']:
-                        click.echo(f"    • {issue}")
-                    
-                    if fix:
-                        section.content = checker.fix_grammar(section.content)
-                        click.echo(f"  ✓ {section.title} fixed")
+
+                if entry['fixed']:
+                    click.echo(f"  ✓ {entry['title']} fixed")
     
     if fix:
         book.save(input)
@@ -270,7 +319,7 @@ def check(input, chapter, fix, provider):
               type=click.Choice(['clarity', 'engagement', 'conciseness', 'detail', 'examples']),
               default='clarity', help='Improvement focus')
 @click.option('--output', '-o', help='Output file path')
-@click.option('--provider', '-p', type=click.Choice(['openai', 'anthropic', 'google', 'cohere', 'mistral', 'huggingface', 'ollama']), default='openai', help='LLM provider')
+@llm_options
 def improve(input, chapter, focus, output, provider):
     """Improve content quality"""
     
@@ -286,16 +335,19 @@ def improve(input, chapter, focus, output, provider):
     click.echo(f"Focus: {focus}")
     
     # Configure LLM
-    llm_provider = get_provider_enum(provider)
-    llm_config = LLMConfig(provider=llm_provider)
-    llm_client = LLMClient(llm_config)
+    llm_client = get_llm_client(provider)
     
     improver = ContentImprover(llm_client)
     
-    # Improve each section
-    for section in chap.sections:
-        click.echo(f"  Improving: {section.title}")
-        improver.improve_section(section, focus=focus)
+    # Improve sections concurrently with bounded in-flight requests
+    semaphore = asyncio.Semaphore(5)
+
+    async def _improve_section(section):
+        async with semaphore:
+            await improver.aimprove_section(section, focus=focus)
+
+    tasks = [_improve_section(section) for section in chap.sections]
+    _run_with_progress(tasks, 'Improving sections')
     
     # Save updated book
     output_path = output or input
@@ -355,26 +407,27 @@ def info(book_file):
     """Display book information"""
     
     try:
-        book = Book.load(book_file)
-        
+        # Only the metadata and chapter structure are needed here, so skip
+        # deserializing section content entirely
+        meta = Book.load_metadata(book_file)
+
         click.echo(f"\n📚 Book Information")
         click.echo("=" * 50)
-        click.echo(f"Title:      {book.title}")
-        click.echo(f"Author:     {book.author}")
-        click.echo(f"Language:   {book.programming_language}")
-        click.echo(f"Audience:   {book.target_audience}")
-        click.echo(f"Chapters:   {len(book.chapters)}")
-        click.echo(f"Created:    {book.created_at}")
-        click.echo(f"Updated:    {book.updated_at}")
-        
-        if book.description:
-            click.echo(f"\nDescription:\n{book.description}")
-        
+        click.echo(f"Title:      {meta['title']}")
+        click.echo(f"Author:     {meta['author']}")
+        click.echo(f"Language:   {meta['programming_language']}")
+        click.echo(f"Audience:   {meta['target_audience']}")
+        click.echo(f"Chapters:   {len(meta['chapters'])}")
+        click.echo(f"Created:    {meta['created_at']}")
+        click.echo(f"Updated:    {meta['updated_at']}")
+
+        if meta['description']:
+            click.echo(f"\nDescription:\n{meta['description']}")
+
         click.echo("\n📑 Chapters:")
-        for chapter in book.chapters:
-            sections_count = len(chapter.sections)
-            click.echo(f"  {chapter.number}. {chapter.title} ({sections_count} sections)")
-        
+        for chapter in meta['chapters']:
+            click.echo(f"  {chapter['number']}. {chapter['title']} ({chapter['section_count']} sections)")
+
     except Exception as e:
         click.echo(f"✗ Error loading book: {e}", err=True)
 
@@ -382,7 +435,7 @@ def info(book_file):
 @main.command()
 @click.option('--input', '-i', required=True, help='Input book file (JSON)')
 @click.option('--output', '-o', help='Output file path')
-@click.option('--provider', '-p', type=click.Choice(['openai', 'anthropic', 'google', 'cohere', 'mistral', 'huggingface', 'ollama']), default='openai', help='LLM provider')
+@llm_options
 def generate_index(input, output, provider):
     """Generate an index of terms for the book"""
     
@@ -390,15 +443,13 @@ def generate_index(input, output, provider):
     click.echo(f"Generating index for: {book.title}")
     
     # Configure LLM
-    llm_provider = get_provider_enum(provider)
-    llm_config = LLMConfig(provider=llm_provider)
-    llm_client = LLMClient(llm_config)
+    llm_client = get_llm_client(provider)
     
     editor = BookEditor(llm_client)
     index = editor.generate_index(book)
     
     click.echo(f"\n📑 Index ({len(index)} terms)")
-    for entry in index[:20]:  # Show first 20
+    for entry in islice(index, 20):  # Show first 20
         locations = ', '.join(entry['locations'][:3])
         click.echo(f"  {entry['term']}: {locations}")
     
@@ -415,7 +466,7 @@ def generate_index(input, output, provider):
 @main.command()
 @click.option('--input', '-i', required=True, help='Input book file (JSON)')
 @click.option('--output', '-o', help='Output file path')
-@click.option('--provider', '-p', type=click.Choice(['openai', 'anthropic', 'google', 'cohere', 'mistral', 'huggingface', 'ollama']), default='openai', help='LLM provider')
+@llm_options
 def generate_glossary(input, output, provider):
     """Generate a glossary of technical terms"""
     
@@ -423,15 +474,13 @@ def generate_glossary(input, output, provider):
     click.echo(f"Generating glossary for: {book.title}")
     
     # Configure LLM
-    llm_provider = get_provider_enum(provider)
-    llm_config = LLMConfig(provider=llm_provider)
-    llm_client = LLMClient(llm_config)
+    llm_client = get_llm_client(provider)
     
     editor = BookEditor(llm_client)
     glossary = editor.generate_glossary(book)
     
     click.echo(f"\n📖 Glossary ({len(glossary)} terms)")
-    for term, definition in list(glossary.items())[:10]:
+    for term, definition in islice(glossary.items(), 10):
         click.echo(f"\n{term}:")
         click.echo(f"  {definition}")
     
@@ -468,7 +517,7 @@ def validate_references(input):
 @click.option('--input', '-i', required=True, help='Input book file (JSON)')
 @click.option('--output', '-o', help='Output file path')
 @click.option('--style', '-s', default='PEP 8', help='Code style guide (e.g., PEP 8, Google, Airbnb)')
-@click.option('--provider', '-p', type=click.Choice(['openai', 'anthropic', 'google', 'cohere', 'mistral', 'huggingface', 'ollama']), default='openai', help='LLM provider')
+@llm_options
 def format_code(input, output, style, provider):
     """Format all code examples to follow a style guide"""
     
@@ -477,9 +526,7 @@ def format_code(input, output, style, provider):
     click.echo(f"Style guide: {style}")
     
     # Configure LLM
-    llm_provider = get_provider_enum(provider)
-    llm_config = LLMConfig(provider=llm_provider)
-    llm_client = LLMClient(llm_config)
+    llm_client = get_llm_client(provider)
     
     editor = BookEditor(llm_client)
     
@@ -494,7 +541,7 @@ def format_code(input, output, style, provider):
 @main.command()
 @click.option('--input', '-i', required=True, help='Input book file (JSON)')
 @click.option('--output', '-o', help='Output file path')
-@click.option('--provider', '-p', type=click.Choice(['openai', 'anthropic', 'google', 'cohere', 'mistral', 'huggingface', 'ollama']), default='openai', help='LLM provider')
+@llm_options
 def add_objectives(input, output, provider):
     """Add learning objectives to each chapter"""
     
@@ -502,9 +549,7 @@ def add_objectives(input, output, provider):
     click.echo(f"Adding learning objectives to: {book.title}")
     
     # Configure LLM
-    llm_provider = get_provider_enum(provider)
-    llm_config = LLMConfig(provider=llm_provider)
-    llm_client = LLMClient(llm_config)
+    llm_client = get_llm_client(provider)
     
     editor = BookEditor(llm_client)
     
@@ -567,7 +612,7 @@ def check_consistency(input):
 @click.option('--output', '-o', default='output/book', help='Output file path (without extension)')
 @click.option('--format', '-f', type=click.Choice(['pdf', 'html', 'epub', 'markdown', 'pdf-pandoc']), 
               default='pdf', help='Output format')
-@click.option('--provider', type=click.Choice(['openai', 'anthropic', 'google', 'cohere', 'mistral', 'huggingface', 'ollama']), 
+@click.option('--provider', type=PROVIDER_CHOICES,
               default='openai', help='LLM provider')
 @click.option('--verbose', '-v', is_flag=True, help='Show detailed progress')
 def agentic(prompt, output, format, provider, verbose):
@@ -604,9 +649,7 @@ def agentic(prompt, output, format, provider, verbose):
             click.echo(f"[{percent:5.1f}%] {message}")
     
     # Configure LLM
-    llm_provider = get_provider_enum(provider)
-    llm_config = LLMConfig(provider=llm_provider)
-    llm_client = LLMClient(llm_config)
+    llm_client = get_llm_client(provider)
     
     # Create generator
     generator = AgenticBookGenerator(
@@ -2,16 +2,32 @@
 Content improver for enhancing book content
 """
 
+import asyncio
 from typing import Optional, Dict, Any
-from ..models.book import Section
-from ..utils.llm_client import LLMClient, LLMConfig
+from ..models.book import Book, Chapter, Section
+from ..utils.llm_client import CachedLLMClient, LLMClient, LLMConfig
+from ..utils.response_parsing import parse_sections
+
+
+# Delimiter the model is asked to echo between improved sections
+_SECTION_BOUNDARY = "<<<SEC_BOUNDARY>>>"
 
 
 class ContentImprover:
     """AI-powered content improvement tool"""
-    
+
+    # Instances only ever carry the client; slots keep per-instance
+    # memory down when pipelines create one improver per worker
+    __slots__ = ("llm_client",)
+
     def __init__(self, llm_client: Optional[LLMClient] = None):
-        self.llm_client = llm_client or LLMClient(LLMConfig())
+        # Improvement prompts repeat heavily across runs (same focus
+        # instructions, often the same text), so serve repeats from the
+        # on-disk response cache
+        llm_client = llm_client or LLMClient(LLMConfig())
+        if not isinstance(llm_client, CachedLLMClient):
+            llm_client = CachedLLMClient(llm_client)
+        self.llm_client = llm_client
 
     def improve_section(
         self,
@@ -19,22 +35,76 @@ class ContentImprover:
         focus: str = "clarity"
     ) -> Section:
         """Improve a section's content"""
-        
+
         if not section.content:
             return section
 
         improved_content = self.improve_text(section.content, focus)
         section.content = improved_content
-        
+
         return section
 
-    def improve_text(
+    async def aimprove_section(
         self,
-        text: str,
+        section: Section,
         focus: str = "clarity"
-    ) -> str:
-        """Improve text based on specific focus area"""
-        
+    ) -> Section:
+        """Improve a section's content asynchronously"""
+
+        if not section.content:
+            return section
+
+        section.content = await self.aimprove_text(section.content, focus)
+        return section
+
+    def improve_chapter(
+        self,
+        chapter: Chapter,
+        focus: str = "clarity"
+    ) -> Chapter:
+        """
+        Improve every section of a chapter in one batched LLM call
+
+        All section contents are sent in a single delimited prompt and
+        the response is split back into sections, replacing one
+        round-trip per section with one per chapter. Falls back to
+        per-section calls if the response does not split cleanly.
+        """
+        sections = [s for s in chapter.sections if s.content]
+        if not sections:
+            return chapter
+
+        _, system_prompt = self._improve_prompt("", focus)
+        body = f"\n{_SECTION_BOUNDARY}\n".join(
+            f"SECTION {i}:\n{section.content}"
+            for i, section in enumerate(sections, 1)
+        )
+        prompt = f"""
+Improve each of the following sections with focus on: {focus}
+
+Keep every section self-contained and in the same order. Return ONLY the
+improved sections, separated by the exact delimiter '{_SECTION_BOUNDARY}',
+without the 'SECTION n:' labels.
+
+{body}
+"""
+
+        response = self.llm_client.generate_text(prompt, system_prompt)
+        chunks = [c.strip() for c in response.split(_SECTION_BOUNDARY)] if response else []
+
+        if len(chunks) == len(sections) and all(chunks):
+            for section, improved in zip(sections, chunks):
+                section.content = improved
+        else:
+            # Fall back to per-section calls if the split doesn't line up
+            for section in sections:
+                self.improve_section(section, focus)
+
+        return chapter
+
+    def _improve_prompt(self, text: str, focus: str) -> tuple:
+        """Build the (prompt, system_prompt) pair for a text improvement"""
+
         focus_prompts = {
             "clarity": "Make the text clearer and easier to understand without losing technical accuracy.",
             "engagement": "Make the text more engaging and interesting while maintaining professionalism.",
@@ -58,13 +128,135 @@ Text:
 
 Return ONLY the improved text.
 """
+        return prompt, system_prompt
+
+    def improve_text(
+        self,
+        text: str,
+        focus: str = "clarity"
+    ) -> str:
+        """Improve text based on specific focus area"""
+
+        if not text or not text.strip():
+            return text
 
+        prompt, system_prompt = self._improve_prompt(text, focus)
         improved = self.llm_client.generate_text(prompt, system_prompt)
         return improved.strip()
 
+    async def aimprove_text(
+        self,
+        text: str,
+        focus: str = "clarity"
+    ) -> str:
+        """Improve text asynchronously based on specific focus area"""
+
+        if not text or not text.strip():
+            return text
+
+        prompt, system_prompt = self._improve_prompt(text, focus)
+        improved = await self.llm_client.generate_text_async(prompt, system_prompt)
+        return improved.strip()
+
+    async def aimprove_book(
+        self,
+        book: Book,
+        focus: str = "clarity",
+        concurrency: int = 5
+    ) -> Book:
+        """
+        Improve every section in the book with bounded concurrency
+
+        All section prompts are fired together under an asyncio.Semaphore,
+        so the pass finishes in roughly the slowest-call latency times
+        sections / concurrency instead of the sum of every round-trip.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _improve(section: Section):
+            async with semaphore:
+                await self.aimprove_section(section, focus)
+
+        sections = [s for chapter in book.chapters for s in chapter.sections]
+        await asyncio.gather(*(_improve(s) for s in sections))
+        return book
+
+    def improve_book(
+        self,
+        book: Book,
+        focus: str = "clarity",
+        concurrency: int = 5
+    ) -> Book:
+        """Synchronous wrapper around aimprove_book"""
+        return asyncio.run(self.aimprove_book(book, focus, concurrency))
+
+    def polish_text(
+        self,
+        text: str,
+        tasks: Optional[list] = None
+    ) -> str:
+        """
+        Apply several polish passes to text in a single LLM call
+
+        A full polish previously meant calling improve_text,
+        add_transitions and enhance_with_examples back to back — three
+        round-trips per text. One prompt now enumerates the requested
+        transformations in order and returns the final result.
+
+        Args:
+            text: The text to polish
+            tasks: Ordered transformations to apply; any improve_text
+                focus plus "transitions" and "examples". Defaults to
+                ["clarity", "transitions", "examples"]
+
+        Returns:
+            The polished text
+        """
+        if not text or not text.strip():
+            return text
+
+        tasks = tasks or ["clarity", "transitions", "examples"]
+        task_instructions = {
+            "clarity": "Make the text clearer and easier to understand without losing technical accuracy.",
+            "engagement": "Make the text more engaging and interesting while maintaining professionalism.",
+            "conciseness": "Make the text more concise while preserving all important information.",
+            "detail": "Add more detail and depth to the explanations.",
+            "examples": "Add or improve concrete examples that illustrate the concepts.",
+            "transitions": "Add smooth transitions between paragraphs to improve flow.",
+        }
+
+        steps = "\n".join(
+            f"{i}. {task_instructions.get(task, task)}"
+            for i, task in enumerate(tasks, 1)
+        )
+
+        system_prompt = (
+            "You are an expert technical writer and editor. Apply each requested "
+            "transformation in order, producing one final text that reflects all "
+            "of them while maintaining accuracy and the author's voice."
+        )
+
+        prompt = f"""
+Apply the following transformations to the text, in order:
+
+{steps}
+
+Text:
+{text}
+
+Return ONLY the final polished text.
+"""
+
+        polished = self.llm_client.generate_text(prompt, system_prompt)
+        return polished.strip()
+
     def add_transitions(self, text: str) -> str:
         """Add smooth transitions between paragraphs"""
-        
+
+        # Nothing to transition between with fewer than two paragraphs
+        if not text or text.count('\n\n') < 1:
+            return text
+
         system_prompt = (
             "You are an expert technical writer. Add smooth transitions between "
             "paragraphs to improve flow."
@@ -147,28 +339,9 @@ PRIORITY_CHANGES:
 
     def _parse_suggestions(self, response: str) -> Dict[str, Any]:
         """Parse improvement suggestions"""
-        
-        result = {
-            "strengths": [],
-            "improvements": [],
-            "priorities": []
-        }
 
-        current_section = None
-        for line in response.split('\n'):
-            line = line.strip()
-            if not line:
-                continue
-
-            if line.startswith("STRENGTHS:"):
-                current_section = "strengths"
-            elif line.startswith("AREAS_FOR_IMPROVEMENT:"):
-                current_section = "improvements"
-            elif line.startswith("PRIORITY_CHANGES:"):
-                current_section = "priorities"
-            elif line.startswith("-") and current_section:
-                item = line.lstrip("- ").strip()
-                if item:
-                    result[current_section].append(item)
-
-        return result
+        return parse_sections(response, {
+            "STRENGTHS": "strengths",
+            "AREAS_FOR_IMPROVEMENT": "improvements",
+            "PRIORITY_CHANGES": "priorities"
+        })
@@ -2,19 +2,32 @@
 Grammar and style checker using LLM
 """
 
-from typing import Dict, Any, Optional
-from ..utils.llm_client import LLMClient, LLMConfig
+import json
+from typing import Dict, Any, List, Optional
+from ..models.book import Chapter
+from ..utils.json_extraction import extract_json_object
+from ..utils.response_parsing import parse_sections
+from ..utils.llm_client import CachedLLMClient, LLMClient, LLMConfig
 
 
 class GrammarChecker:
     """AI-powered grammar and style checker"""
-    
+
+    # Instances only ever carry the client; slots keep per-instance
+    # memory down when pipelines create one checker per worker
+    __slots__ = ("llm_client",)
+
     def __init__(self, llm_client: Optional[LLMClient] = None):
-        self.llm_client = llm_client or LLMClient(LLMConfig())
+        # Re-checking unchanged text is common; the on-disk response
+        # cache makes those repeats free
+        llm_client = llm_client or LLMClient(LLMConfig())
+        if not isinstance(llm_client, CachedLLMClient):
+            llm_client = CachedLLMClient(llm_client)
+        self.llm_client = llm_client
+
+    def _grammar_prompt(self, text: str) -> tuple:
+        """Build the (prompt, system_prompt) pair for a grammar check"""
 
-    def check_grammar(self, text: str) -> Dict[str, Any]:
-        """Check grammar and style in text"""
-        
         system_prompt = (
             "You are an expert editor and grammarian. Identify grammar, spelling, "
             "and style issues in technical writing. Be precise and helpful."
@@ -43,13 +56,105 @@ SCORE: [1-10]
 
 If no issues found, state "No issues found."
 """
+        return prompt, system_prompt
+
+    def check_grammar(self, text: str) -> Dict[str, Any]:
+        """Check grammar and style in text"""
 
+        prompt, system_prompt = self._grammar_prompt(text)
         response = self.llm_client.generate_text(prompt, system_prompt)
         return self._parse_grammar_response(response)
 
-    def fix_grammar(self, text: str) -> str:
-        """Automatically fix grammar issues in text"""
-        
+    async def acheck_grammar(self, text: str) -> Dict[str, Any]:
+        """Check grammar and style in text asynchronously"""
+        prompt, system_prompt = self._grammar_prompt(text)
+        response = await self.llm_client.generate_text_async(prompt, system_prompt)
+        return self._parse_grammar_response(response)
+
+    def check_and_fix_chapter(self, chapter: Chapter, fix: bool = False) -> List[Dict[str, Any]]:
+        """
+        Check grammar for a whole chapter in one batched LLM call
+
+        The chapter introduction and every section's content are sent as a
+        single JSON payload and the model reports issues (and corrected
+        text) per entry, replacing two round-trips per section with one
+        call per chapter.
+
+        Args:
+            chapter: The chapter to check
+            fix: If True, write corrected text back to the chapter
+
+        Returns:
+            List of {"title", "issues", "fixed"} entries, one per checked
+            text; "fixed" is True when corrected text was written back
+        """
+        entries = []
+        if chapter.introduction:
+            entries.append({"id": 0, "title": "Introduction", "text": chapter.introduction})
+        for i, section in enumerate(chapter.sections, 1):
+            if section.content:
+                entries.append({"id": i, "title": section.title, "text": section.content})
+
+        if not entries:
+            return []
+
+        def _apply_fix(entry_id: int, fixed: str):
+            if entry_id == 0:
+                chapter.introduction = fixed
+            else:
+                chapter.sections[entry_id - 1].content = fixed
+
+        system_prompt = (
+            "You are an expert editor and grammarian. Identify grammar, spelling, "
+            "and style issues in technical writing and provide corrected text."
+        )
+
+        payload = json.dumps([{"id": e["id"], "text": e["text"]} for e in entries])
+        prompt = f"""
+Review each of the following texts for grammar, spelling, and style issues.
+
+Texts (JSON):
+{payload}
+
+Respond with a JSON object of the form:
+{{"sections": [{{"id": <id>, "issues": ["..."], "fixed": "<corrected text>"}}]}}
+
+Include every id. Use an empty issues list when a text is fine and return
+the original text as "fixed".
+"""
+
+        response = self.llm_client.generate_text(prompt, system_prompt)
+        parsed = extract_json_object(response) if response else None
+
+        results = []
+        if parsed and isinstance(parsed.get("sections"), list):
+            by_id = {e["id"]: e for e in entries}
+            for item in parsed["sections"]:
+                entry = by_id.get(item.get("id"))
+                if not entry:
+                    continue
+                issues = [str(issue) for issue in item.get("issues", [])]
+                fixed_text = item.get("fixed")
+                # The model may list issues without usable corrected
+                # text; only report a fix when one was actually applied
+                was_fixed = bool(fix and issues and fixed_text)
+                if was_fixed:
+                    _apply_fix(entry["id"], str(fixed_text).strip())
+                results.append({"title": entry["title"], "issues": issues, "fixed": was_fixed})
+            return results
+
+        # Fall back to per-text calls if the batched response is unparseable
+        for entry in entries:
+            issues = self.check_grammar(entry["text"])["issues"]
+            was_fixed = bool(fix and issues)
+            if was_fixed:
+                _apply_fix(entry["id"], self.fix_grammar(entry["text"]))
+            results.append({"title": entry["title"], "issues": issues, "fixed": was_fixed})
+        return results
+
+    def _fix_prompt(self, text: str) -> tuple:
+        """Build the (prompt, system_prompt) pair for a grammar fix"""
+
         system_prompt = (
             "You are an expert editor. Fix grammar, spelling, and style issues "
             "while preserving the original meaning and technical accuracy."
@@ -63,17 +168,31 @@ Return ONLY the corrected text.
 Text:
 {text}
 """
+        return prompt, system_prompt
 
+    def fix_grammar(self, text: str) -> str:
+        """Automatically fix grammar issues in text"""
+
+        if not text or not text.strip():
+            return text
+
+        prompt, system_prompt = self._fix_prompt(text)
         corrected = self.llm_client.generate_text(prompt, system_prompt)
         return corrected.strip()
 
-    def check_technical_accuracy(
-        self,
-        text: str,
-        programming_language: str = "Python"
-    ) -> Dict[str, Any]:
-        """Check technical accuracy of content"""
-        
+    async def afix_grammar(self, text: str) -> str:
+        """Automatically fix grammar issues in text asynchronously"""
+
+        if not text or not text.strip():
+            return text
+
+        prompt, system_prompt = self._fix_prompt(text)
+        corrected = await self.llm_client.generate_text_async(prompt, system_prompt)
+        return corrected.strip()
+
+    def _technical_prompt(self, text: str, programming_language: str) -> tuple:
+        """Build the (prompt, system_prompt) pair for a technical review"""
+
         system_prompt = (
             f"You are an expert {programming_language} developer and technical reviewer. "
             "Identify technical inaccuracies and outdated information."
@@ -97,13 +216,36 @@ TECHNICAL_ISSUES:
 
 ACCURACY_SCORE: [1-10]
 """
+        return prompt, system_prompt
 
+    def check_technical_accuracy(
+        self,
+        text: str,
+        programming_language: str = "Python"
+    ) -> Dict[str, Any]:
+        """Check technical accuracy of content"""
+
+        prompt, system_prompt = self._technical_prompt(text, programming_language)
         response = self.llm_client.generate_text(prompt, system_prompt)
         return self._parse_technical_response(response)
 
+    async def acheck_technical_accuracy(
+        self,
+        text: str,
+        programming_language: str = "Python"
+    ) -> Dict[str, Any]:
+        """Check technical accuracy of content asynchronously"""
+
+        prompt, system_prompt = self._technical_prompt(text, programming_language)
+        response = await self.llm_client.generate_text_async(prompt, system_prompt)
+        return self._parse_technical_response(response)
+
     def improve_readability(self, text: str) -> str:
         """Improve text readability while maintaining technical accuracy"""
-        
+
+        if not text or not text.strip():
+            return text
+
         system_prompt = (
             "You are an expert technical writer. Improve readability of technical "
             "content while maintaining accuracy and precision."
@@ -129,61 +271,24 @@ Return ONLY the improved text.
 
     def _parse_grammar_response(self, response: str) -> Dict[str, Any]:
         """Parse grammar check response"""
-        
-        result = {
-            "issues": [],
-            "suggestions": [],
-            "score": 0
-        }
-
-        current_section = None
-        for line in response.split('\n'):
-            line = line.strip()
-            if not line:
-                continue
-
-            if line.startswith("ISSUES:"):
-                current_section = "issues"
-            elif line.startswith("SUGGESTIONS:"):
-                current_section = "suggestions"
-            elif line.startswith("SCORE:"):
-                try:
-                    score_str = line.replace("SCORE:", "").strip()
-                    result["score"] = int(score_str.split('/')[0])
-                except (ValueError, IndexError):
-                    result["score"] = 0
-            elif line.startswith("-") and current_section:
-                item = line.lstrip("- ").strip()
-                if item and item.lower() != "no issues found.":
-                    result[current_section].append(item)
 
+        result = parse_sections(
+            response,
+            {"ISSUES": "issues", "SUGGESTIONS": "suggestions"},
+            {"SCORE": "score"}
+        )
+        for bucket in ("issues", "suggestions"):
+            result[bucket] = [
+                item for item in result[bucket]
+                if item.lower() != "no issues found."
+            ]
         return result
 
     def _parse_technical_response(self, response: str) -> Dict[str, Any]:
         """Parse technical accuracy response"""
-        
-        result = {
-            "issues": [],
-            "score": 0
-        }
-
-        current_section = None
-        for line in response.split('\n'):
-            line = line.strip()
-            if not line:
-                continue
-
-            if line.startswith("TECHNICAL_ISSUES:"):
-                current_section = "issues"
-            elif line.startswith("ACCURACY_SCORE:"):
-                try:
-                    score_str = line.replace("ACCURACY_SCORE:", "").strip()
-                    result["score"] = int(score_str.split('/')[0])
-                except (ValueError, IndexError):
-                    result["score"] = 0
-            elif line.startswith("-") and current_section == "issues":
-                item = line.lstrip("- ").strip()
-                if item:
-                    result["issues"].append(item)
 
-        return result
+        return parse_sections(
+            response,
+            {"TECHNICAL_ISSUES": "issues"},
+            {"ACCURACY_SCORE": "score"}
+        )
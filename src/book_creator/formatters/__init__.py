@@ -1,9 +1,29 @@
 """Formatters package initialization"""
 
-from .html_formatter import HTMLFormatter
-from .pdf_formatter import PDFFormatter
-from .epub_formatter import EPUBFormatter
-from .markdown_formatter import MarkdownFormatter
-from .pandoc_pdf_formatter import PandocPDFFormatter
+from importlib import import_module
+
+# Submodules are imported on first attribute access (PEP 562) so that
+# e.g. importing MarkdownFormatter does not pull in fpdf or ebooklib
+_EXPORTS = {
+    "HTMLFormatter": ".html_formatter",
+    "PDFFormatter": ".pdf_formatter",
+    "EPUBFormatter": ".epub_formatter",
+    "MarkdownFormatter": ".markdown_formatter",
+    "PandocPDFFormatter": ".pandoc_pdf_formatter",
+}
 
 __all__ = ["HTMLFormatter", "PDFFormatter", "EPUBFormatter", "MarkdownFormatter", "PandocPDFFormatter"]
+
+
+def __getattr__(name):
+    try:
+        module = import_module(_EXPORTS[name], __name__)
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
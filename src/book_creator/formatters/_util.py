@@ -0,0 +1,18 @@
+"""
+Shared helpers for the formatters package
+"""
+
+import os
+
+
+# Directories already created this process; repeated exports to the
+# same location skip the stat+mkdir syscalls entirely
+_ENSURED_DIRS: set = set()
+
+
+def ensure_parent_dir(path: str):
+    """Create the parent directory of path once per process"""
+    directory = os.path.dirname(path) or "."
+    if directory not in _ENSURED_DIRS:
+        os.makedirs(directory, exist_ok=True)
+        _ENSURED_DIRS.add(directory)
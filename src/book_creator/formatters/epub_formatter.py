@@ -5,6 +5,78 @@ EPUB formatter for exporting books to EPUB format
 import os
 from ebooklib import epub
 from ..models.book import Book
+from ._util import ensure_parent_dir
+
+
+# Single-pass escape table; chained .replace calls rescanned the code
+# string per character and never escaped '&' at all
+_HTML_ESCAPE_TABLE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+
+# Built once at import; the stylesheet never changes at runtime
+_DEFAULT_CSS = """
+        body {
+            font-family: Georgia, serif;
+            line-height: 1.6;
+            color: #333;
+            margin: 1em;
+        }
+
+        h1 {
+            color: #2c3e50;
+            border-bottom: 2px solid #3498db;
+            padding-bottom: 0.5em;
+        }
+
+        h2 {
+            color: #34495e;
+            margin-top: 1.5em;
+        }
+
+        .introduction, .summary {
+            background-color: #e8f4f8;
+            padding: 1em;
+            border-left: 4px solid #3498db;
+            margin: 1em 0;
+        }
+
+        .code-example {
+            background-color: #f8f8f8;
+            border: 1px solid #ddd;
+            border-radius: 5px;
+            margin: 1em 0;
+            padding: 1em;
+        }
+
+        .code-example pre {
+            margin: 0;
+            overflow-x: auto;
+        }
+
+        .code-example code {
+            font-family: 'Courier New', monospace;
+            font-size: 0.9em;
+        }
+
+        .exercise {
+            background-color: #fff9e6;
+            border: 1px solid #f39c12;
+            border-radius: 5px;
+            padding: 1em;
+            margin: 1em 0;
+        }
+
+        .exercise h4 {
+            color: #f39c12;
+            margin-top: 0;
+        }
+
+        .hints {
+            background-color: #fff;
+            padding: 0.5em;
+            border-radius: 3px;
+            margin-top: 0.5em;
+        }
+        """
 
 
 class EPUBFormatter:
@@ -14,7 +86,7 @@ class EPUBFormatter:
         """Format book as EPUB file"""
         
         # Ensure output directory exists
-        os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else ".", exist_ok=True)
+        ensure_parent_dir(output_path)
         
         # Create EPUB book
         ebook = epub.EpubBook()
@@ -32,6 +104,15 @@ class EPUBFormatter:
         epub_chapters = []
         spine = ['nav']
         
+        # One CSS item shared by every chapter; building it per chapter
+        # duplicated the stylesheet N times
+        css_item = epub.EpubItem(
+            uid="style_default",
+            file_name="style/nav.css",
+            media_type="text/css",
+            content=self._default_css()
+        )
+
         # Add preface if exists
         if book.preface:
             preface = epub.EpubHtml(
@@ -46,7 +127,7 @@ class EPUBFormatter:
         
         # Add each chapter
         for chapter in book.chapters:
-            epub_chapter = self._create_epub_chapter(chapter)
+            epub_chapter = self._create_epub_chapter(chapter, css_item)
             ebook.add_item(epub_chapter)
             epub_chapters.append(epub_chapter)
             spine.append(epub_chapter)
@@ -62,19 +143,12 @@ class EPUBFormatter:
         ebook.spine = spine
         
         # Add CSS
-        css = self._default_css()
-        nav_css = epub.EpubItem(
-            uid="style_nav",
-            file_name="style/nav.css",
-            media_type="text/css",
-            content=css
-        )
-        ebook.add_item(nav_css)
+        ebook.add_item(css_item)
         
         # Write EPUB file
         epub.write_epub(output_path, ebook, {})
 
-    def _create_epub_chapter(self, chapter) -> epub.EpubHtml:
+    def _create_epub_chapter(self, chapter, css_item: epub.EpubItem) -> epub.EpubHtml:
         """Create an EPUB chapter from a Chapter object"""
         
         epub_chapter = epub.EpubHtml(
@@ -83,79 +157,79 @@ class EPUBFormatter:
             lang='en'
         )
         
-        content = f'<h1>Chapter {chapter.number}: {chapter.title}</h1>\n'
-        
+        # Collect fragments and join once; += would recopy the growing
+        # buffer for every section
+        parts = [f'<h1>Chapter {chapter.number}: {chapter.title}</h1>\n']
+
         # Add introduction
         if chapter.introduction:
-            content += f'<div class="introduction">{self._format_text(chapter.introduction)}</div>\n'
-        
+            parts.append(f'<div class="introduction">{self._format_text(chapter.introduction)}</div>\n')
+
         # Add sections
         for section in chapter.sections:
-            content += self._format_section(section)
-        
+            parts.append(self._format_section(section))
+
         # Add summary
         if chapter.summary:
-            content += f'<div class="summary"><h2>Summary</h2>{self._format_text(chapter.summary)}</div>\n'
-        
-        epub_chapter.content = content
-        epub_chapter.add_item(epub.EpubItem(
-            uid="style_default",
-            file_name="style/nav.css",
-            media_type="text/css",
-            content=self._default_css()
-        ))
+            parts.append(f'<div class="summary"><h2>Summary</h2>{self._format_text(chapter.summary)}</div>\n')
+
+        # ebooklib accepts bytes; encoding here avoids it re-encoding a
+        # second full copy of the chapter at write time
+        epub_chapter.content = ''.join(parts).encode('utf-8')
+        epub_chapter.add_item(css_item)
         
         return epub_chapter
 
     def _format_section(self, section) -> str:
         """Format a section as HTML"""
         
-        html = f'<div class="section">\n'
-        html += f'<h2>{section.title}</h2>\n'
-        
+        parts = ['<div class="section">\n', f'<h2>{section.title}</h2>\n']
+
         if section.content:
-            html += self._format_text(section.content)
-        
+            parts.append(self._format_text(section.content))
+
         # Add code examples
         for example in section.code_examples:
-            html += self._format_code_example(example)
-        
+            parts.append(self._format_code_example(example))
+
         # Add exercises
         for exercise in section.exercises:
-            html += self._format_exercise(exercise)
-        
-        html += '</div>\n'
-        return html
+            parts.append(self._format_exercise(exercise))
+
+        parts.append('</div>\n')
+        return ''.join(parts)
 
     def _format_code_example(self, example) -> str:
         """Format a code example"""
         
-        html = '<div class="code-example">\n'
-        
+        parts = ['<div class="code-example">\n']
+
         if example.get('explanation'):
-            html += f'<p class="explanation">{example["explanation"]}</p>\n'
-        
-        code = example.get('code', '').replace('<', '&lt;').replace('>', '&gt;')
-        html += f'<pre><code>{code}</code></pre>\n'
-        html += '</div>\n'
-        
-        return html
+            parts.append(f'<p class="explanation">{example["explanation"]}</p>\n')
+
+        code = example.get('code', '').translate(_HTML_ESCAPE_TABLE)
+        parts.append(f'<pre><code>{code}</code></pre>\n')
+        parts.append('</div>\n')
+
+        return ''.join(parts)
 
     def _format_exercise(self, exercise) -> str:
         """Format an exercise"""
         
-        html = '<div class="exercise">\n'
-        html += '<h4>Exercise</h4>\n'
-        html += f'<p>{exercise.get("question", "")}</p>\n'
-        
+        parts = [
+            '<div class="exercise">\n',
+            '<h4>Exercise</h4>\n',
+            f'<p>{exercise.get("question", "")}</p>\n'
+        ]
+
         if exercise.get('hints'):
-            html += '<div class="hints"><h5>Hints:</h5><ul>\n'
+            parts.append('<div class="hints"><h5>Hints:</h5><ul>\n')
             for hint in exercise['hints']:
-                html += f'<li>{hint}</li>\n'
-            html += '</ul></div>\n'
-        
-        html += '</div>\n'
-        return html
+                parts.append(f'<li>{hint}</li>\n')
+            parts.append('</ul></div>\n')
+
+        parts.append('</div>\n')
+        return ''.join(parts)
 
     def _format_text(self, text: str) -> str:
         """Format plain text as HTML paragraphs"""
@@ -167,67 +241,5 @@ class EPUBFormatter:
 
     def _default_css(self) -> str:
         """Default CSS for EPUB"""
-        return """
-        body {
-            font-family: Georgia, serif;
-            line-height: 1.6;
-            color: #333;
-            margin: 1em;
-        }
+        return _DEFAULT_CSS
 
-        h1 {
-            color: #2c3e50;
-            border-bottom: 2px solid #3498db;
-            padding-bottom: 0.5em;
-        }
-
-        h2 {
-            color: #34495e;
-            margin-top: 1.5em;
-        }
-
-        .introduction, .summary {
-            background-color: #e8f4f8;
-            padding: 1em;
-            border-left: 4px solid #3498db;
-            margin: 1em 0;
-        }
-
-        .code-example {
-            background-color: #f8f8f8;
-            border: 1px solid #ddd;
-            border-radius: 5px;
-            margin: 1em 0;
-            padding: 1em;
-        }
-
-        .code-example pre {
-            margin: 0;
-            overflow-x: auto;
-        }
-
-        .code-example code {
-            font-family: 'Courier New', monospace;
-            font-size: 0.9em;
-        }
-
-        .exercise {
-            background-color: #fff9e6;
-            border: 1px solid #f39c12;
-            border-radius: 5px;
-            padding: 1em;
-            margin: 1em 0;
-        }
-
-        .exercise h4 {
-            color: #f39c12;
-            margin-top: 0;
-        }
-
-        .hints {
-            background-color: #fff;
-            padding: 0.5em;
-            border-radius: 3px;
-            margin-top: 0.5em;
-        }
-        """
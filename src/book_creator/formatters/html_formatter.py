@@ -2,165 +2,22 @@
 HTML formatter for exporting books to HTML
 """
 
+import json
 import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from typing import Optional
-from jinja2 import Template
-from ..models.book import Book
+from jinja2 import Environment
+from ..models.book import Book, Chapter
+from ._util import ensure_parent_dir
 from pygments import highlight
 from pygments.lexers import get_lexer_by_name
 from pygments.formatters import HtmlFormatter
 
 
-class HTMLFormatter:
-    """Format books as HTML"""
-    
-    def __init__(self, template_path: Optional[str] = None):
-        self.template_path = template_path
-        self.css_style = self._default_css()
-
-    def format(self, book: Book, output_path: str):
-        """Format book as HTML file"""
-        
-        html_content = self._generate_html(book)
-        
-        # Ensure output directory exists
-        os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else ".", exist_ok=True)
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-
-    def _generate_html(self, book: Book) -> str:
-        """Generate HTML content for the book"""
-        
-        template = Template(self._default_template())
-        
-        # Process chapters and sections
-        chapters_html = []
-        for chapter in book.chapters:
-            chapter_html = self._format_chapter(chapter)
-            chapters_html.append(chapter_html)
-
-        html_content = template.render(
-            book=book,
-            chapters_html=chapters_html,
-            css_style=self.css_style
-        )
-
-        return html_content
-
-    def _format_chapter(self, chapter) -> str:
-        """Format a single chapter"""
-        
-        html = f"""
-        <div class="chapter" id="chapter-{chapter.number}">
-            <h1>Chapter {chapter.number}: {chapter.title}</h1>
-            
-            {f'<div class="introduction">{self._format_text(chapter.introduction)}</div>' if chapter.introduction else ''}
-            
-            <div class="sections">
-        """
-
-        for section in chapter.sections:
-            html += self._format_section(section)
-
-        html += """
-            </div>
-        """
-
-        if chapter.summary:
-            html += f"""
-            <div class="summary">
-                <h3>Summary</h3>
-                {self._format_text(chapter.summary)}
-            </div>
-            """
-
-        html += "</div>"
-        return html
-
-    def _format_section(self, section) -> str:
-        """Format a single section"""
-        
-        html = f"""
-        <div class="section">
-            <h2>{section.title}</h2>
-            <div class="content">
-                {self._format_text(section.content)}
-            </div>
-        """
-
-        # Add code examples
-        if section.code_examples:
-            html += '<div class="code-examples">'
-            for example in section.code_examples:
-                html += self._format_code_example(example)
-            html += '</div>'
-
-        # Add exercises
-        if section.exercises:
-            html += '<div class="exercises">'
-            for exercise in section.exercises:
-                html += self._format_exercise(exercise)
-            html += '</div>'
-
-        html += "</div>"
-        return html
-
-    def _format_code_example(self, example) -> str:
-        """Format a code example with syntax highlighting"""
-        
-        code = example.get('code', '')
-        language = example.get('language', 'python')
-        explanation = example.get('explanation', '')
-
-        try:
-            lexer = get_lexer_by_name(language, stripall=True)
-            formatter = HtmlFormatter(style='colorful', noclasses=True)
-            highlighted = highlight(code, lexer, formatter)
-        except Exception:
-            highlighted = f'<pre><code>{code}</code></pre>'
-
-        html = f"""
-        <div class="code-example">
-            {f'<p class="explanation">{explanation}</p>' if explanation else ''}
-            {highlighted}
-        </div>
-        """
-        return html
-
-    def _format_exercise(self, exercise) -> str:
-        """Format an exercise"""
-        
-        html = f"""
-        <div class="exercise">
-            <h4>Exercise</h4>
-            <p class="question">{exercise.get('question', '')}</p>
-        """
-
-        if exercise.get('hints'):
-            html += '<div class="hints"><h5>Hints:</h5><ul>'
-            for hint in exercise['hints']:
-                html += f'<li>{hint}</li>'
-            html += '</ul></div>'
-
-        if exercise.get('answer'):
-            html += f'<div class="answer"><h5>Answer:</h5><p>{exercise["answer"]}</p></div>'
-
-        html += '</div>'
-        return html
-
-    def _format_text(self, text: str) -> str:
-        """Format text with basic HTML"""
-        if not text:
-            return ""
-        
-        # Simple paragraph splitting
-        paragraphs = text.split('\n\n')
-        return '\n'.join([f'<p>{p.strip()}</p>' for p in paragraphs if p.strip()])
-
-    def _default_template(self) -> str:
-        """Default HTML template"""
-        return """
+# Template and CSS sources never change at runtime; compiling the Jinja
+# template once at import time avoids re-lexing it on every export
+_DEFAULT_TEMPLATE = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -207,9 +64,7 @@ class HTMLFormatter:
 </html>
 """
 
-    def _default_css(self) -> str:
-        """Default CSS styling"""
-        return """
+_DEFAULT_CSS = """
         body {
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
             line-height: 1.6;
@@ -360,3 +215,239 @@ class HTMLFormatter:
             }
         }
         """
+
+_ENV = Environment(auto_reload=False)
+_BOOK_TEMPLATE = _ENV.from_string(_DEFAULT_TEMPLATE)
+
+# Books below this many chapters render serially; Pygments highlighting
+# is CPU-bound, so bigger books fan chapters out across processes
+_PARALLEL_RENDER_THRESHOLD = 20
+
+
+@lru_cache(maxsize=32)
+def _get_lexer(language: str):
+    """Look up a Pygments lexer once per language"""
+    return get_lexer_by_name(language, stripall=True)
+
+
+@lru_cache(maxsize=4)
+def _get_formatter(style: str) -> HtmlFormatter:
+    """Build a Pygments HTML formatter once per style"""
+    # Class-based output: one shared style block in the page CSS instead
+    # of inline style attributes on every highlighted token
+    return HtmlFormatter(style=style, cssclass='highlight')
+
+
+def _render_chapter(chapter) -> str:
+    """Render one chapter; module-level so chapters can be pickled to workers"""
+    return HTMLFormatter()._format_chapter(chapter)
+
+
+class HTMLFormatter:
+    """Format books as HTML"""
+    
+    def __init__(self, template_path: Optional[str] = None):
+        self.template_path = template_path
+        self.css_style = (
+            self._default_css()
+            + _get_formatter('colorful').get_style_defs('.highlight')
+        )
+
+    def format(self, book: Book, output_path):
+        """Format book as HTML to a file path or writable stream"""
+
+        html_content = self._generate_html(book)
+
+        if hasattr(output_path, 'write'):
+            output_path.write(html_content)
+            return
+
+        # Ensure output directory exists
+        ensure_parent_dir(output_path)
+
+        # Encode once and write the bytes directly; a text-mode handle
+        # would re-encode and newline-translate the whole document
+        with open(output_path, 'wb') as f:
+            f.write(html_content.encode('utf-8'))
+
+    def format_to_str(self, book: Book) -> str:
+        """Format book as an HTML string, skipping the filesystem"""
+        return self._generate_html(book)
+
+    def format_streaming(self, input_path: str, output_path: str):
+        """
+        Render a book JSON file to HTML one chapter at a time
+
+        Builds a lightweight book with chapter stubs for the header and
+        table of contents, then renders full chapters lazily through the
+        template's streaming interface, keeping peak memory at one chapter
+        regardless of book size.
+        """
+        with open(input_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        # Chapter stubs carry just enough for the table of contents
+        book = Book(
+            title=data.get("title", ""),
+            author=data.get("author", ""),
+            description=data.get("description", ""),
+            preface=data.get("preface", ""),
+            chapters=[
+                Chapter(title=c.get("title", ""), number=c.get("number", 0))
+                for c in data.get("chapters", [])
+            ]
+        )
+
+        def _chapters_html():
+            for chapter_data in data.get("chapters", []):
+                yield self._format_chapter(Chapter.from_dict(chapter_data))
+
+        # Ensure output directory exists
+        ensure_parent_dir(output_path)
+
+        with open(output_path, 'w', encoding='utf-8') as f:
+            for chunk in _BOOK_TEMPLATE.generate(
+                book=book,
+                chapters_html=_chapters_html(),
+                css_style=self.css_style
+            ):
+                f.write(chunk)
+
+    def _generate_html(self, book: Book) -> str:
+        """Generate HTML content for the book"""
+        
+        # Chapters are independent and highlighting is GIL-bound, so
+        # large books render across worker processes
+        if len(book.chapters) >= _PARALLEL_RENDER_THRESHOLD:
+            with ProcessPoolExecutor() as executor:
+                chapters_html = list(executor.map(_render_chapter, book.chapters))
+        else:
+            chapters_html = [self._format_chapter(chapter) for chapter in book.chapters]
+
+        html_content = _BOOK_TEMPLATE.render(
+            book=book,
+            chapters_html=chapters_html,
+            css_style=self.css_style
+        )
+
+        return html_content
+
+    def _format_chapter(self, chapter) -> str:
+        """Format a single chapter"""
+        
+        # Collect fragments and join once; += would recopy the growing
+        # buffer for every section
+        parts = [f"""
+        <div class="chapter" id="chapter-{chapter.number}">
+            <h1>Chapter {chapter.number}: {chapter.title}</h1>
+
+            {f'<div class="introduction">{self._format_text(chapter.introduction)}</div>' if chapter.introduction else ''}
+
+            <div class="sections">
+        """]
+
+        for section in chapter.sections:
+            parts.append(self._format_section(section))
+
+        parts.append("""
+            </div>
+        """)
+
+        if chapter.summary:
+            parts.append(f"""
+            <div class="summary">
+                <h3>Summary</h3>
+                {self._format_text(chapter.summary)}
+            </div>
+            """)
+
+        parts.append("</div>")
+        return "".join(parts)
+
+    def _format_section(self, section) -> str:
+        """Format a single section"""
+        
+        parts = [f"""
+        <div class="section">
+            <h2>{section.title}</h2>
+            <div class="content">
+                {self._format_text(section.content)}
+            </div>
+        """]
+
+        # Add code examples
+        if section.code_examples:
+            parts.append('<div class="code-examples">')
+            for example in section.code_examples:
+                parts.append(self._format_code_example(example))
+            parts.append('</div>')
+
+        # Add exercises
+        if section.exercises:
+            parts.append('<div class="exercises">')
+            for exercise in section.exercises:
+                parts.append(self._format_exercise(exercise))
+            parts.append('</div>')
+
+        parts.append("</div>")
+        return "".join(parts)
+
+    def _format_code_example(self, example) -> str:
+        """Format a code example with syntax highlighting"""
+        
+        code = example.get('code', '')
+        language = example.get('language', 'python')
+        explanation = example.get('explanation', '')
+
+        try:
+            lexer = _get_lexer(language)
+            formatter = _get_formatter('colorful')
+            highlighted = highlight(code, lexer, formatter)
+        except Exception:
+            highlighted = f'<pre><code>{code}</code></pre>'
+
+        html = f"""
+        <div class="code-example">
+            {f'<p class="explanation">{explanation}</p>' if explanation else ''}
+            {highlighted}
+        </div>
+        """
+        return html
+
+    def _format_exercise(self, exercise) -> str:
+        """Format an exercise"""
+        
+        parts = [f"""
+        <div class="exercise">
+            <h4>Exercise</h4>
+            <p class="question">{exercise.get('question', '')}</p>
+        """]
+
+        if exercise.get('hints'):
+            parts.append('<div class="hints"><h5>Hints:</h5><ul>')
+            for hint in exercise['hints']:
+                parts.append(f'<li>{hint}</li>')
+            parts.append('</ul></div>')
+
+        if exercise.get('answer'):
+            parts.append(f'<div class="answer"><h5>Answer:</h5><p>{exercise["answer"]}</p></div>')
+
+        parts.append('</div>')
+        return "".join(parts)
+
+    def _format_text(self, text: str) -> str:
+        """Format text with basic HTML"""
+        if not text:
+            return ""
+        
+        # Simple paragraph splitting
+        paragraphs = text.split('\n\n')
+        return '\n'.join([f'<p>{p.strip()}</p>' for p in paragraphs if p.strip()])
+
+    def _default_template(self) -> str:
+        """Default HTML template"""
+        return _DEFAULT_TEMPLATE
+
+    def _default_css(self) -> str:
+        """Default CSS styling"""
+        return _DEFAULT_CSS
@@ -2,110 +2,178 @@
 Markdown formatter for exporting books to Markdown
 """
 
+import json
 import os
-from ..models.book import Book
+from concurrent.futures import ProcessPoolExecutor
+from ..models.book import Book, Chapter
+from ._util import ensure_parent_dir
+
+
+# Below this chapter count the pickling overhead of worker processes
+# outweighs the parallel formatting win
+_PARALLEL_CHAPTER_THRESHOLD = 8
+
+
+def _format_chapter_md(chapter: Chapter) -> str:
+    """Format one chapter (module-level so worker processes can pickle it)"""
+    return MarkdownFormatter()._format_chapter(chapter)
 
 
 class MarkdownFormatter:
     """Format books as Markdown"""
-    
-    def format(self, book: Book, output_path: str):
-        """Format book as Markdown file"""
-        
+
+    def format(self, book: Book, output_path, parallel: bool = False):
+        """Format book as Markdown to a file path or writable stream"""
+
+        markdown = self._generate_markdown(book, parallel=parallel)
+
+        if hasattr(output_path, 'write'):
+            output_path.write(markdown)
+            return
+
         # Ensure output directory exists
-        os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else ".", exist_ok=True)
-        
-        markdown = self._generate_markdown(book)
-        
+        ensure_parent_dir(output_path)
+
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write(markdown)
 
-    def _generate_markdown(self, book: Book) -> str:
-        """Generate Markdown content for the book"""
-        
-        md = f"# {book.title}\n\n"
-        md += f"**Author:** {book.author}\n\n"
-        
+    def format_to_str(self, book: Book) -> str:
+        """Format book as a Markdown string, skipping the filesystem"""
+        return self._generate_markdown(book)
+
+    def format_streaming(self, input_path: str, output_path: str):
+        """
+        Render a book JSON file to Markdown one chapter at a time
+
+        Materializes a single Chapter at a time instead of the whole Book
+        object graph and writes each rendered chapter straight to the
+        output file, keeping peak memory at one chapter regardless of
+        book size.
+        """
+        with open(input_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        # Chapter stubs carry just enough for the table of contents
+        book = Book(
+            title=data.get("title", ""),
+            author=data.get("author", ""),
+            description=data.get("description", ""),
+            preface=data.get("preface", ""),
+            chapters=[
+                Chapter(title=c.get("title", ""), number=c.get("number", 0))
+                for c in data.get("chapters", [])
+            ]
+        )
+
+        # Ensure output directory exists
+        ensure_parent_dir(output_path)
+
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(self._format_front_matter(book))
+            for chapter_data in data.get("chapters", []):
+                f.write(self._format_chapter(Chapter.from_dict(chapter_data)))
+
+    def _format_front_matter(self, book: Book) -> str:
+        """Format the title block, description, preface and table of contents"""
+
+        # Collect fragments and join once; += would recopy the growing
+        # buffer for every TOC entry
+        parts = [f"# {book.title}\n\n", f"**Author:** {book.author}\n\n"]
+
         if book.description:
-            md += f"## Description\n\n{book.description}\n\n"
-        
+            parts.append(f"## Description\n\n{book.description}\n\n")
+
         if book.preface:
-            md += f"## Preface\n\n{book.preface}\n\n"
-        
+            parts.append(f"## Preface\n\n{book.preface}\n\n")
+
         # Table of contents
-        md += "## Table of Contents\n\n"
-        for chapter in book.chapters:
-            md += f"{chapter.number}. [{chapter.title}](#chapter-{chapter.number})\n"
-        md += "\n---\n\n"
-        
-        # Chapters
-        for chapter in book.chapters:
-            md += self._format_chapter(chapter)
-        
-        return md
+        parts.append("## Table of Contents\n\n")
+        parts.append("".join(
+            [f"{chapter.number}. [{chapter.title}](#chapter-{chapter.number})\n"
+             for chapter in book.chapters]
+        ))
+        parts.append("\n---\n\n")
+
+        return "".join(parts)
+
+    def _generate_markdown(self, book: Book, parallel: bool = False) -> str:
+        """Generate Markdown content for the book"""
+
+        # Chapters format independently; for very large books spread
+        # them across worker processes
+        if parallel and len(book.chapters) >= _PARALLEL_CHAPTER_THRESHOLD:
+            with ProcessPoolExecutor() as executor:
+                chapters = "".join(executor.map(_format_chapter_md, book.chapters))
+            return self._format_front_matter(book) + chapters
+
+        # List comprehensions let join size the result buffer up front,
+        # rather than growing a parts list append by append
+        return self._format_front_matter(book) + "".join(
+            [self._format_chapter(chapter) for chapter in book.chapters]
+        )
 
     def _format_chapter(self, chapter) -> str:
         """Format a chapter as Markdown"""
         
-        md = f"## Chapter {chapter.number}: {chapter.title} {{#chapter-{chapter.number}}}\n\n"
-        
+        parts = [f"## Chapter {chapter.number}: {chapter.title} {{#chapter-{chapter.number}}}\n\n"]
+
         if chapter.introduction:
-            md += f"### Introduction\n\n{chapter.introduction}\n\n"
-        
-        for section in chapter.sections:
-            md += self._format_section(section)
-        
+            parts.append(f"### Introduction\n\n{chapter.introduction}\n\n")
+
+        parts.append("".join(
+            [self._format_section(section) for section in chapter.sections]
+        ))
+
         if chapter.summary:
-            md += f"### Summary\n\n{chapter.summary}\n\n"
-        
-        md += "---\n\n"
-        return md
+            parts.append(f"### Summary\n\n{chapter.summary}\n\n")
+
+        parts.append("---\n\n")
+        return "".join(parts)
 
     def _format_section(self, section) -> str:
         """Format a section as Markdown"""
         
-        md = f"### {section.title}\n\n"
-        
+        parts = [f"### {section.title}\n\n"]
+
         if section.content:
-            md += f"{section.content}\n\n"
-        
+            parts.append(f"{section.content}\n\n")
+
         # Code examples
         for example in section.code_examples:
-            md += self._format_code_example(example)
-        
+            parts.append(self._format_code_example(example))
+
         # Exercises
         for exercise in section.exercises:
-            md += self._format_exercise(exercise)
-        
-        return md
+            parts.append(self._format_exercise(exercise))
+
+        return "".join(parts)
 
     def _format_code_example(self, example) -> str:
         """Format a code example"""
         
-        md = ""
-        
+        parts = []
+
         if example.get('explanation'):
-            md += f"**Example:** {example['explanation']}\n\n"
-        
+            parts.append(f"**Example:** {example['explanation']}\n\n")
+
         language = example.get('language', 'python')
         code = example.get('code', '')
-        md += f"```{language}\n{code}\n```\n\n"
-        
-        return md
+        parts.append(f"```{language}\n{code}\n```\n\n")
+
+        return "".join(parts)
 
     def _format_exercise(self, exercise) -> str:
         """Format an exercise"""
         
-        md = "**Exercise:**\n\n"
-        md += f"{exercise.get('question', '')}\n\n"
-        
+        parts = ["**Exercise:**\n\n", f"{exercise.get('question', '')}\n\n"]
+
         if exercise.get('hints'):
-            md += "**Hints:**\n\n"
+            parts.append("**Hints:**\n\n")
             for hint in exercise['hints']:
-                md += f"- {hint}\n"
-            md += "\n"
-        
+                parts.append(f"- {hint}\n")
+            parts.append("\n")
+
         if exercise.get('answer'):
-            md += f"**Answer:** {exercise['answer']}\n\n"
-        
-        return md
+            parts.append(f"**Answer:** {exercise['answer']}\n\n")
+
+        return "".join(parts)
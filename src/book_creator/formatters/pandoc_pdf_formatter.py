@@ -2,48 +2,141 @@
 Pandoc-based PDF formatter for generating PDFs from Markdown
 """
 
+import hashlib
 import os
+import shlex
 import subprocess
-import tempfile
+import threading
 import re
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 from ..models.book import Book
 from .markdown_formatter import MarkdownFormatter
+from ._util import ensure_parent_dir
+
+
+# Rendered-markdown cache entries kept per formatter instance
+_MARKDOWN_CACHE_MAX = 256
+
+# Highlight styles bundled with every pandoc release; the set is static,
+# so no "pandoc --list-highlight-styles" subprocess is needed to list it
+_SUPPORTED_THEMES = (
+    'pygments', 'tango', 'espresso', 'zenburn', 'kate',
+    'monochrome', 'breezedark', 'haddock'
+)
+
+
+def _engine_opts_from_env() -> list:
+    """Extra --pdf-engine-opt flags from BOOK_CREATOR_PDF_ENGINE_OPTS
+
+    Lets deployments tune the LaTeX engine without a code change — for
+    example "-fmt=/path/preamble.fmt" to reuse a precompiled format and
+    skip the preamble compile that dominates repeated renders.
+    """
+    raw = os.environ.get('BOOK_CREATOR_PDF_ENGINE_OPTS')
+    if not raw:
+        return []
+    return [f'--pdf-engine-opt={opt}' for opt in shlex.split(raw)]
+
+
+def _book_fingerprint(book: Book) -> str:
+    """Stable digest of the book content that feeds markdown rendering"""
+    digest = hashlib.sha1()
+    digest.update(f"{book.title}\x1f{book.author}\x1f{book.description}\x1f{book.preface}".encode())
+    for chapter in book.chapters:
+        digest.update(
+            f"\x1e{chapter.number}\x1f{chapter.title}\x1f{chapter.introduction}\x1f{chapter.summary}".encode()
+        )
+        for section in chapter.sections:
+            digest.update(f"\x1d{section.title}\x1f{section.content}".encode())
+            for example in section.code_examples:
+                digest.update(
+                    f"\x1c{example.get('language', '')}\x1f{example.get('code', '')}\x1f{example.get('explanation', '')}".encode()
+                )
+            for exercise in section.exercises:
+                digest.update(
+                    f"\x1b{exercise.get('question', '')}\x1f{exercise.get('answer', '')}".encode()
+                )
+                for hint in exercise.get('hints') or []:
+                    digest.update(f"\x1a{hint}".encode())
+    return digest.hexdigest()
 
 
 class PandocPDFFormatter:
     """
     Generate PDF from Markdown using Pandoc with strict syntax validation
     """
-    
-    def __init__(self, pandoc_path: str = "pandoc"):
+
+    # Version string per verified pandoc path; constructing a formatter
+    # per book must not fork a subprocess every time
+    _verified_paths: dict = {}
+    _verify_lock = threading.Lock()
+
+    def __init__(self, pandoc_path: str = "pandoc", strict_links: bool = False):
         """
         Initialize Pandoc PDF formatter
-        
+
         Args:
             pandoc_path: Path to pandoc executable (default: "pandoc" from PATH)
+            strict_links: If True, flag bracketed text without a matching
+                '(' or ':' as broken links (prone to false positives)
+
+        The pandoc binary is probed on the first format call, not here,
+        so construction and pure-Python paths like validate_markdown
+        work on machines without pandoc installed.
         """
         self.pandoc_path = pandoc_path
-        self._verify_pandoc()
+        self.strict_links = strict_links
+        # Rendered markdown keyed by book fingerprint (see _render_markdown)
+        self._markdown_cache = {}
     
     def _verify_pandoc(self):
         """Verify that Pandoc is installed and accessible"""
-        try:
-            result = subprocess.run(
-                [self.pandoc_path, "--version"],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            # Extract version for logging
-            version_line = result.stdout.split('\n')[0]
-            print(f"Using {version_line}")
-        except (subprocess.CalledProcessError, FileNotFoundError) as e:
-            raise RuntimeError(
-                f"Pandoc is not installed or not found at '{self.pandoc_path}'. "
-                "Please install Pandoc from https://pandoc.org/installing.html"
-            ) from e
+        with PandocPDFFormatter._verify_lock:
+            if self.pandoc_path in PandocPDFFormatter._verified_paths:
+                return
+            try:
+                result = subprocess.run(
+                    [self.pandoc_path, "--version"],
+                    capture_output=True,
+                    text=True,
+                    check=True
+                )
+                # Extract version for logging
+                version_line = result.stdout.split('\n')[0]
+                print(f"Using {version_line}")
+                PandocPDFFormatter._verified_paths[self.pandoc_path] = version_line
+            except (subprocess.CalledProcessError, FileNotFoundError) as e:
+                raise RuntimeError(
+                    f"Pandoc is not installed or not found at '{self.pandoc_path}'. "
+                    "Please install Pandoc from https://pandoc.org/installing.html"
+                ) from e
     
+    def _render_markdown(self, book: Book) -> tuple[str, bool, list[str]]:
+        """
+        Render and validate a book's markdown, memoized by content hash
+
+        Rebuilding an unchanged book re-traverses every section and
+        re-validates megabytes of markdown for an identical result, so
+        both are cached against a fingerprint of the book's content.
+        """
+        fingerprint = _book_fingerprint(book)
+        cached = self._markdown_cache.get(fingerprint)
+        if cached is not None:
+            return cached
+
+        markdown_content = MarkdownFormatter()._generate_markdown(book)
+        is_valid, errors = self.validate_markdown(markdown_content)
+
+        if len(self._markdown_cache) >= _MARKDOWN_CACHE_MAX:
+            self._markdown_cache.clear()
+        self._markdown_cache[fingerprint] = (markdown_content, is_valid, errors)
+        return markdown_content, is_valid, errors
+
+    def reset(self):
+        """Drop cached rendered markdown (for long-lived formatter instances)"""
+        self._markdown_cache.clear()
+
     def validate_markdown(self, markdown_content: str) -> tuple[bool, list[str]]:
         """
         Validate Markdown syntax according to CommonMark standard
@@ -55,53 +148,73 @@ class PandocPDFFormatter:
             Tuple of (is_valid, list of error messages)
         """
         errors = []
-        
-        # Check for balanced code fences
-        code_fence_pattern = r'^```'
-        fence_matches = re.findall(code_fence_pattern, markdown_content, re.MULTILINE)
-        if len(fence_matches) % 2 != 0:
-            errors.append("Unbalanced code fences: odd number of ``` delimiters found")
-        
-        # Check for proper heading syntax (must have space after #)
-        lines = markdown_content.split('\n')
-        for i, line in enumerate(lines, 1):
-            # Check headings
-            if line.startswith('#'):
-                if not re.match(r'^#{1,6}\s+\S', line):
-                    if not re.match(r'^#{1,6}$', line):  # Empty heading is also invalid
-                        errors.append(f"Line {i}: Invalid heading syntax - missing space after #")
-            
-            # Check for common Markdown syntax errors
+
+        # Single pass over the document, walking line boundaries by
+        # index: no line list is materialized and slices are only taken
+        # for the rare lines a check actually fires on. Code-fence
+        # contents are skipped outright.
+        in_fence = False
+        fence_count = 0
+        # Bracket heuristics misfire on prose like "[sic]", so the link
+        # scan is opt-in
+        check_links = self.strict_links
+        content = markdown_content
+        n = len(content)
+        i = 0
+        lineno = 0
+
+        while i < n:
+            lineno += 1
+            j = content.find('\n', i)
+            if j == -1:
+                j = n
+
+            first = content[i] if i < j else ''
+
+            if first == '`' and content.startswith('```', i):
+                fence_count += 1
+                in_fence = not in_fence
+            elif in_fence:
+                pass
+
+            # Check headings (must have 1-6 #'s followed by a space and text)
+            elif first == '#':
+                k = i
+                while k < j and content[k] == '#':
+                    k += 1
+                hashes = k - i
+                if hashes <= 6 and k == j:
+                    pass  # Bare #'s; historically tolerated
+                elif not (hashes <= 6 and content[k].isspace() and content[k:j].strip()):
+                    errors.append(f"Line {lineno}: Invalid heading syntax - missing space after #")
+
             # Lists should have space after marker (only check lines starting with list marker)
-            stripped_line = line.lstrip()
-            if stripped_line and stripped_line[0] in ['*', '-', '+']:
-                # Check if it's actually a list (not bold/italic or horizontal rule)
-                if len(stripped_line) > 1 and stripped_line[1] not in [' ', '*', '-', '+']:
-                    errors.append(f"Line {i}: List marker should be followed by a space")
-            
-        
-        # Check for proper link syntax
-        for match in re.finditer(r'\[[^\]]*\](?!\()', markdown_content):
-            # Found a bracket without matching parenthesis
-            context = markdown_content[max(0, match.start()-20):match.end()+20]
-            if not re.match(r'\[[^\]]+\]:', context):  # Not a reference-style link definition
-                errors.append(f"Potential broken link syntax near: {context[:40]}...")
-        
-        # Validate code block language specifiers
-        code_blocks = re.finditer(r'^```(\w*)\n', markdown_content, re.MULTILINE)
-        for match in code_blocks:
-            lang = match.group(1)
-            if lang:  # If language is specified, check it's valid
-                # Common valid languages
-                valid_langs = {
-                    'python', 'javascript', 'java', 'c', 'cpp', 'csharp', 'ruby', 
-                    'go', 'rust', 'typescript', 'php', 'swift', 'kotlin', 'bash',
-                    'shell', 'sql', 'html', 'css', 'json', 'xml', 'yaml', 'markdown'
-                }
-                if lang.lower() not in valid_langs:
-                    # Warning, not error - Pandoc supports many languages
-                    pass
-        
+            elif first in '*-+ \t':
+                stripped = content[i:j].lstrip() if first in ' \t' else content[i:j]
+                if stripped and stripped[0] in ('*', '-', '+'):
+                    # Check if it's actually a list (not bold/italic or horizontal rule)
+                    if len(stripped) > 1 and stripped[1] not in (' ', '*', '-', '+'):
+                        errors.append(f"Line {lineno}: List marker should be followed by a space")
+
+            if check_links and not in_fence:
+                # Check for proper link syntax: [text] must be followed
+                # by '(' (inline link) or ':' (reference definition)
+                pos = content.find('[', i, j)
+                while pos != -1:
+                    close = content.find(']', pos + 1, j)
+                    if close == -1:
+                        break
+                    following = content[close + 1:close + 2] if close + 1 < j else ''
+                    if following not in ('(', ':'):
+                        context = content[max(i, pos - 20):min(j, close + 21)]
+                        errors.append(f"Potential broken link syntax near: {context[:40]}...")
+                    pos = content.find('[', close + 1, j)
+
+            i = j + 1
+
+        if fence_count % 2 != 0:
+            errors.append("Unbalanced code fences: odd number of ``` delimiters found")
+
         return (len(errors) == 0, errors)
     
     def format(self, book: Book, output_path: str, 
@@ -118,80 +231,104 @@ class PandocPDFFormatter:
             syntax_highlighting: Enable syntax highlighting for code blocks
             theme: Syntax highlighting theme (tango, pygments, kate, monochrome, etc.)
         """
+        # Fail fast on a missing binary before any rendering work
+        self._verify_pandoc()
+
         # Ensure output directory exists
-        os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else ".", exist_ok=True)
-        
-        # Generate Markdown content
-        md_formatter = MarkdownFormatter()
-        
-        # Create temporary file for Markdown
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False, encoding='utf-8') as tmp_md:
-            tmp_md_path = tmp_md.name
-            markdown_content = md_formatter._generate_markdown(book)
-            
-            # Validate Markdown syntax
-            is_valid, errors = self.validate_markdown(markdown_content)
-            
-            if not is_valid:
-                error_msg = "Markdown validation failed:\n" + "\n".join(f"  - {err}" for err in errors)
-                if strict_validation:
-                    # Clean up temp file
-                    try:
-                        os.unlink(tmp_md_path)
-                    except FileNotFoundError:
-                        # It's safe to ignore if the temp file was already deleted
-                        pass
-                    raise ValueError(error_msg)
-                else:
-                    print(f"Warning: {error_msg}")
-            
-            tmp_md.write(markdown_content)
+        ensure_parent_dir(output_path)
         
-        try:
-            # Build Pandoc command
-            pandoc_args = [
-                self.pandoc_path,
-                tmp_md_path,
-                '-o', output_path,
-                '--from', 'markdown',
-                '--to', 'pdf',
-                '--pdf-engine=xelatex',  # Better Unicode support
-                '--toc',  # Table of contents
-                '--toc-depth=3',
-                '--number-sections',
-                '-V', 'geometry:margin=1in',
-                '-V', 'fontsize=11pt',
-                '-V', 'documentclass=report',
-            ]
-            
-            # Add syntax highlighting
-            if syntax_highlighting:
-                pandoc_args.extend(['--highlight-style', theme])
+        # Render and validate (memoized on book content)
+        markdown_content, is_valid, errors = self._render_markdown(book)
+
+        if not is_valid:
+            error_msg = "Markdown validation failed:\n" + "\n".join(f"  - {err}" for err in errors)
+            if strict_validation:
+                raise ValueError(error_msg)
             else:
-                pandoc_args.append('--no-highlight')
-            
-            # Execute Pandoc
-            result = subprocess.run(
-                pandoc_args,
-                capture_output=True,
-                text=True,
-                check=False
-            )
-            
-            if result.returncode != 0:
-                error_msg = f"Pandoc PDF generation failed:\n{result.stderr}"
-                raise RuntimeError(error_msg)
-            
-            print(f"PDF generated successfully: {output_path}")
-            
-        finally:
-            # Clean up temporary file
-            try:
-                os.unlink(tmp_md_path)
-            except FileNotFoundError:
-                # It's safe to ignore if the temp file was already deleted
-                pass
+                print(f"Warning: {error_msg}")
+
+        # Build Pandoc command; markdown is piped over stdin ('-') rather
+        # than bounced through a temp file on disk
+        pandoc_args = [
+            self.pandoc_path,
+            '-',
+            '-o', output_path,
+            '--from', 'markdown',
+            '--to', 'pdf',
+            '--pdf-engine=xelatex',  # Better Unicode support
+            '--toc',  # Table of contents
+            '--toc-depth=3',
+            '--number-sections',
+            '-V', 'geometry:margin=1in',
+            '-V', 'fontsize=11pt',
+            '-V', 'documentclass=report',
+        ]
+        pandoc_args.extend(_engine_opts_from_env())
+
+        # Add syntax highlighting
+        if syntax_highlighting:
+            pandoc_args.extend(['--highlight-style', theme])
+        else:
+            pandoc_args.append('--no-highlight')
+
+        # Execute Pandoc
+        result = subprocess.run(
+            pandoc_args,
+            input=markdown_content.encode('utf-8'),
+            capture_output=True,
+            check=False
+        )
+
+        if result.returncode != 0:
+            stderr = result.stderr.decode('utf-8', errors='replace')
+            error_msg = f"Pandoc PDF generation failed:\n{stderr}"
+            raise RuntimeError(error_msg)
+
+        print(f"PDF generated successfully: {output_path}")
     
+    def format_many(self, books: List[Book], output_dir: str,
+                    strict_validation: bool = True,
+                    syntax_highlighting: bool = True,
+                    theme: str = "tango",
+                    max_workers: Optional[int] = None) -> List[str]:
+        """
+        Format several books as PDFs, running Pandoc conversions concurrently
+
+        Each book still needs its own Pandoc/xelatex run — a single merged
+        invocation cannot be split back into per-book PDFs — but the
+        subprocess and engine startup cost is amortized by overlapping the
+        conversions, which release the GIL while Pandoc works.
+
+        Args:
+            books: Books to format
+            output_dir: Directory receiving one <title>.pdf per book
+            strict_validation: If True, fail on Markdown syntax errors
+            syntax_highlighting: Enable syntax highlighting for code blocks
+            theme: Syntax highlighting theme
+            max_workers: Concurrent Pandoc processes (default: CPU count)
+
+        Returns:
+            List of generated PDF paths, in input order
+        """
+        os.makedirs(output_dir, exist_ok=True)
+
+        def _safe_name(title: str) -> str:
+            return re.sub(r'[^A-Za-z0-9_-]+', '_', title).strip('_') or "book"
+
+        def _convert(book: Book) -> str:
+            output_path = os.path.join(output_dir, f"{_safe_name(book.title)}.pdf")
+            self.format(
+                book, output_path,
+                strict_validation=strict_validation,
+                syntax_highlighting=syntax_highlighting,
+                theme=theme
+            )
+            return output_path
+
+        workers = max_workers or os.cpu_count() or 1
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_convert, books))
+
     def format_with_custom_template(self, book: Book, output_path: str,
                                    template_path: Optional[str] = None,
                                    metadata: Optional[dict] = None):
@@ -204,51 +341,42 @@ class PandocPDFFormatter:
             template_path: Path to custom Pandoc template file
             metadata: Additional metadata to pass to Pandoc
         """
-        md_formatter = MarkdownFormatter()
-        
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False, encoding='utf-8') as tmp_md:
-            tmp_md_path = tmp_md.name
-            markdown_content = md_formatter._generate_markdown(book)
-            
-            # Validate
-            is_valid, errors = self.validate_markdown(markdown_content)
-            if not is_valid:
-                os.unlink(tmp_md_path)
-                raise ValueError("Markdown validation failed:\n" + "\n".join(errors))
-            
-            tmp_md.write(markdown_content)
-        
-        try:
-            pandoc_args = [
-                self.pandoc_path,
-                tmp_md_path,
-                '-o', output_path,
-                '--pdf-engine=xelatex',
-                '--highlight-style', 'tango',
-            ]
-            
-            if template_path:
-                pandoc_args.extend(['--template', template_path])
-            
-            if metadata:
-                for key, value in metadata.items():
-                    pandoc_args.extend(['-M', f'{key}={value}'])
-            
-            result = subprocess.run(pandoc_args, capture_output=True, text=True, check=False)
-            
-            if result.returncode != 0:
-                raise RuntimeError(f"Pandoc failed: {result.stderr}")
-                
-        finally:
-            try:
-                os.unlink(tmp_md_path)
-            except FileNotFoundError:
-                # Ignore errors if the temp file was already deleted
-                pass
+        self._verify_pandoc()
+
+        # Render and validate (memoized on book content)
+        markdown_content, is_valid, errors = self._render_markdown(book)
+        if not is_valid:
+            raise ValueError("Markdown validation failed:\n" + "\n".join(errors))
+
+        pandoc_args = [
+            self.pandoc_path,
+            '-',
+            '-o', output_path,
+            '--from', 'markdown',
+            '--pdf-engine=xelatex',
+            '--highlight-style', 'tango',
+        ]
+        pandoc_args.extend(_engine_opts_from_env())
+
+        if template_path:
+            pandoc_args.extend(['--template', template_path])
+
+        if metadata:
+            for key, value in metadata.items():
+                pandoc_args.extend(['-M', f'{key}={value}'])
+
+        result = subprocess.run(
+            pandoc_args,
+            input=markdown_content.encode('utf-8'),
+            capture_output=True,
+            check=False
+        )
+
+        if result.returncode != 0:
+            stderr = result.stderr.decode('utf-8', errors='replace')
+            raise RuntimeError(f"Pandoc failed: {stderr}")
     
     def get_supported_themes(self) -> list[str]:
         """Get list of supported syntax highlighting themes"""
-        return [
-            'pygments', 'tango', 'espresso', 'zenburn', 'kate', 
-            'monochrome', 'breezedark', 'haddock'
-        ]
+        # Fresh list so callers can mutate their copy safely
+        return list(_SUPPORTED_THEMES)
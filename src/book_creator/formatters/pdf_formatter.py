@@ -3,21 +3,24 @@ PDF formatter for exporting books to PDF
 """
 
 import os
-from fpdf import FPDF
 from ..models.book import Book
+from ._util import ensure_parent_dir
 
 
 class PDFFormatter:
     """Format books as PDF"""
-    
+
     def __init__(self):
         self.pdf = None
 
     def format(self, book: Book, output_path: str):
         """Format book as PDF file"""
-        
+        # Imported here so exports that never touch PDF don't pay for
+        # fpdf (and its PIL dependency) at startup
+        from fpdf import FPDF
+
         # Ensure output directory exists
-        os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else ".", exist_ok=True)
+        ensure_parent_dir(output_path)
         
         self.pdf = FPDF()
         self.pdf.set_auto_page_break(auto=True, margin=15)
@@ -63,9 +66,13 @@ class PDFFormatter:
         self.pdf.ln(5)
         
         self.pdf.set_font('Arial', '', 12)
-        for chapter in book.chapters:
-            toc_line = f"Chapter {chapter.number}: {chapter.title}"
-            self.pdf.cell(0, 8, toc_line, 0, 1)
+        # One multi_cell for the whole TOC instead of a cell per chapter
+        toc_text = '\n'.join(
+            f"Chapter {chapter.number}: {chapter.title}"
+            for chapter in book.chapters
+        )
+        if toc_text:
+            self.pdf.multi_cell(0, 8, toc_text)
 
     def _add_chapter(self, chapter):
         """Add a chapter to PDF"""
@@ -125,13 +132,17 @@ class PDFFormatter:
         self.pdf.set_font('Courier', '', 9)
         self.pdf.set_fill_color(240, 240, 240)
         
-        code_lines = example.get('code', '').split('\n')
-        for line in code_lines:
-            # Handle long lines
-            if len(line) > 90:
-                line = line[:90] + '...'
-            self.pdf.cell(0, 5, line, 0, 1, fill=True)
-        
+        # Truncate long lines up front and hand the whole block to one
+        # multi_cell call rather than a cell per line
+        code_lines = [
+            line if len(line) <= 90 else line[:90] + '...'
+            for line in example.get('code', '').split('\n')
+        ]
+        # multi_cell leaves the cursor at the right margin; start the
+        # code block from the left margin
+        self.pdf.set_x(self.pdf.l_margin)
+        self.pdf.multi_cell(0, 5, '\n'.join(code_lines), fill=True)
+
         self.pdf.ln(3)
 
     def _add_exercise(self, exercise):
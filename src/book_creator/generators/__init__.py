@@ -1,7 +1,27 @@
 """Generators package initialization"""
 
-from .outline_generator import OutlineGenerator
-from .content_generator import ContentGenerator
-from .code_generator import CodeGenerator
+from importlib import import_module
+
+# Submodules are imported on first attribute access (PEP 562) so that
+# importing one generator does not drag in the others' import chains
+_EXPORTS = {
+    "OutlineGenerator": ".outline_generator",
+    "ContentGenerator": ".content_generator",
+    "CodeGenerator": ".code_generator",
+}
 
 __all__ = ["OutlineGenerator", "ContentGenerator", "CodeGenerator"]
+
+
+def __getattr__(name):
+    try:
+        module = import_module(_EXPORTS[name], __name__)
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
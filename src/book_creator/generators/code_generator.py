@@ -2,15 +2,25 @@
 Code generator for creating code examples and explanations
 """
 
+import re
 from typing import Dict, Any, Optional
-from ..utils.llm_client import LLMClient, LLMConfig
+from ..utils.llm_client import CachedLLMClient, LLMClient, LLMConfig
+
+
+# Exercise section headers, located in one pass over the response
+_EXERCISE_SECTION_RE = re.compile(r'^(QUESTION|HINTS|SOLUTION|EXPLANATION):\s*', re.MULTILINE)
 
 
 class CodeGenerator:
     """Generates code examples with explanations using LLM"""
-    
+
     def __init__(self, llm_client: Optional[LLMClient] = None):
-        self.llm_client = llm_client or LLMClient(LLMConfig())
+        # Identical concept/language/difficulty requests recur across
+        # books; serve repeats from the response cache
+        llm_client = llm_client or LLMClient(LLMConfig())
+        if not isinstance(llm_client, CachedLLMClient):
+            llm_client = CachedLLMClient(llm_client)
+        self.llm_client = llm_client
 
     def generate_code_example(
         self,
@@ -154,24 +164,26 @@ EXPLANATION:
             "language": language
         }
 
-        sections = response.split('\n\n')
-
-        for section in sections:
-            section = section.strip()
-            if section.startswith("QUESTION:"):
-                exercise["question"] = section.replace("QUESTION:", "").strip()
-            elif section.startswith("HINTS:"):
-                hints_text = section.replace("HINTS:", "").strip()
+        # Slice the response between header matches instead of splitting
+        # into paragraphs and re-testing each against every label
+        matches = list(_EXERCISE_SECTION_RE.finditer(response))
+        for match, next_match in zip(matches, matches[1:] + [None]):
+            end = next_match.start() if next_match else len(response)
+            body = response[match.end():end].strip()
+            label = match.group(1)
+
+            if label == "QUESTION":
+                exercise["question"] = body
+            elif label == "HINTS":
                 exercise["hints"] = [
                     h.lstrip("- ").strip()
-                    for h in hints_text.split('\n')
+                    for h in body.split('\n')
                     if h.strip().startswith("-")
                 ]
-            elif section.startswith("SOLUTION:"):
-                solution_text = section.replace("SOLUTION:", "").strip()
-                exercise["solution"] = self._clean_code(solution_text)
-            elif section.startswith("EXPLANATION:"):
-                exercise["explanation"] = section.replace("EXPLANATION:", "").strip()
+            elif label == "SOLUTION":
+                exercise["solution"] = self._clean_code(body)
+            elif label == "EXPLANATION":
+                exercise["explanation"] = body
 
         return exercise
 
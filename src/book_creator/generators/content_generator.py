@@ -2,16 +2,22 @@
 Content generator for chapters and sections
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 from ..models.book import Chapter, Section
-from ..utils.llm_client import LLMClient, LLMConfig
+from ..utils.llm_client import CachedLLMClient, LLMClient, LLMConfig
 
 
 class ContentGenerator:
     """Generates content for chapters and sections using LLM"""
-    
+
     def __init__(self, llm_client: Optional[LLMClient] = None):
-        self.llm_client = llm_client or LLMClient(LLMConfig())
+        # Regenerating a section with unchanged inputs repeats the exact
+        # (prompt, system_prompt) pair; serve those from the response cache
+        llm_client = llm_client or LLMClient(LLMConfig())
+        if not isinstance(llm_client, CachedLLMClient):
+            llm_client = CachedLLMClient(llm_client)
+        self.llm_client = llm_client
 
     def generate_section_content(
         self,
@@ -135,15 +141,20 @@ Write the summary now:
                 chapter, programming_language=programming_language
             )
 
-        # Generate content for each section
-        for section in chapter.sections:
-            if not section.content:
-                self.generate_section_content(
-                    section,
-                    chapter_context=chapter.introduction,
-                    programming_language=programming_language,
-                    target_audience=target_audience
-                )
+        # Generate content for each section; the calls are independent
+        # network round-trips, so fan them out instead of serializing
+        pending = [s for s in chapter.sections if not s.content]
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(8, len(pending))) as executor:
+                list(executor.map(
+                    lambda section: self.generate_section_content(
+                        section,
+                        chapter_context=chapter.introduction,
+                        programming_language=programming_language,
+                        target_audience=target_audience
+                    ),
+                    pending
+                ))
 
         # Generate summary
         if not chapter.summary:
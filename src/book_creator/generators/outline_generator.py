@@ -2,26 +2,51 @@
 Outline generator for creating book structures
 """
 
-from typing import Optional
+import asyncio
+import re
+from typing import List, Optional, Tuple
 from ..models.book import Book, Chapter, Section
-from ..utils.llm_client import LLMClient, LLMConfig
+from ..utils.json_extraction import extract_json_object
+from ..utils.llm_client import CachedLLMClient, LLMClient, get_default_client
+
+
+# One multiline alternation finds every outline element in a single C-level
+# scan, replacing the per-line startswith state machine
+_OUTLINE_RE = re.compile(
+    r'^[ \t]*(?:'
+    r'Chapter[ \t]+\d+[ \t]*:[ \t]*(?P<title>.+?)'
+    r'|Description:[ \t]*(?P<desc>.+?)'
+    r'|-[ \t]*(?P<sect>.+?)'
+    r')[ \t\r]*$',
+    re.MULTILINE
+)
+
+_BULLET_RE = re.compile(r'^[ \t]*-[ \t]*(.+?)[ \t\r]*$', re.MULTILINE)
 
 
 class OutlineGenerator:
     """Generates book outlines using LLM"""
-    
+
     def __init__(self, llm_client: Optional[LLMClient] = None):
-        self.llm_client = llm_client or LLMClient(LLMConfig())
+        # Outline prompts are fully determined by (topic, chapter count,
+        # audience, language), so identical requests repeat often; serve
+        # them from the on-disk response cache. The process-wide default
+        # client is shared so per-phase generator instances reuse one
+        # SDK connection pool.
+        llm_client = llm_client or get_default_client()
+        if not isinstance(llm_client, CachedLLMClient):
+            llm_client = CachedLLMClient(llm_client)
+        self.llm_client = llm_client
 
-    def generate_outline(
+    def _outline_prompt(
         self,
         topic: str,
-        num_chapters: int = 10,
-        target_audience: str = "intermediate developers",
-        programming_language: str = "Python"
-    ) -> Book:
-        """Generate a complete book outline"""
-        
+        num_chapters: int,
+        target_audience: str,
+        programming_language: str
+    ) -> tuple:
+        """Build the (prompt, system_prompt) pair for an outline"""
+
         system_prompt = (
             "You are an expert technical writer and educator specializing in "
             "creating comprehensive programming books. Generate well-structured, "
@@ -36,26 +61,94 @@ Programming Language: {programming_language}
 Target Audience: {target_audience}
 Number of Chapters: {num_chapters}
 
-For each chapter, provide:
-1. Chapter title
-2. Brief description
-3. 3-5 section titles
+For each chapter, provide a title, a brief description and 3-5 section titles.
 
-Format the response as follows:
-Chapter 1: [Title]
-Description: [Brief description]
-Sections:
-- [Section 1 title]
-- [Section 2 title]
-- [Section 3 title]
-...
-
-Generate the complete outline now.
+Return ONLY a JSON object of this exact shape:
+{{"chapters": [{{"number": 1, "title": "...", "description": "...", "sections": ["...", "..."]}}]}}
 """
+        return prompt, system_prompt
+
+    def generate_outline(
+        self,
+        topic: str,
+        num_chapters: int = 10,
+        target_audience: str = "intermediate developers",
+        programming_language: str = "Python"
+    ) -> Book:
+        """Generate a complete book outline"""
+
+        prompt, system_prompt = self._outline_prompt(
+            topic, num_chapters, target_audience, programming_language
+        )
+        response = self.llm_client.generate_text(prompt, system_prompt, json_mode=True)
+        book = self._parse_outline_json(response, topic, programming_language, target_audience)
+        if book is not None:
+            return book
+        return self._parse_outline(response, topic, programming_language, target_audience)
+
+    async def agenerate_outline(
+        self,
+        topic: str,
+        num_chapters: int = 10,
+        target_audience: str = "intermediate developers",
+        programming_language: str = "Python"
+    ) -> Book:
+        """Generate a complete book outline asynchronously"""
 
-        response = self.llm_client.generate_text(prompt, system_prompt)
+        prompt, system_prompt = self._outline_prompt(
+            topic, num_chapters, target_audience, programming_language
+        )
+        response = await self.llm_client.generate_text_async(
+            prompt, system_prompt, json_mode=True
+        )
+        book = self._parse_outline_json(response, topic, programming_language, target_audience)
+        if book is not None:
+            return book
         return self._parse_outline(response, topic, programming_language, target_audience)
 
+    def _parse_outline_json(
+        self,
+        response: str,
+        topic: str,
+        programming_language: str,
+        target_audience: str
+    ) -> Optional[Book]:
+        """
+        Build a Book from a JSON outline response
+
+        JSON mode turns parsing into a single orjson/raw_decode pass and
+        removes the format drift the text parser has to tolerate.
+        Returns None when the response holds no usable JSON so callers
+        can fall back to _parse_outline.
+        """
+        data = extract_json_object(response)
+        if not data or not isinstance(data.get("chapters"), list):
+            return None
+
+        book = Book(
+            title=f"Mastering {topic}",
+            author="AI Book Creator",
+            description=f"A comprehensive guide to {topic}",
+            programming_language=programming_language,
+            target_audience=target_audience
+        )
+
+        for index, entry in enumerate(data["chapters"], 1):
+            if not isinstance(entry, dict):
+                continue
+            chapter = Chapter(
+                title=str(entry.get("title", "")).strip() or f"Chapter {index}",
+                number=int(entry.get("number") or index),
+                introduction=str(entry.get("description", "")).strip()
+            )
+            for section_title in entry.get("sections") or []:
+                section_title = str(section_title).strip()
+                if section_title:
+                    chapter.add_section(Section(title=section_title))
+            book.add_chapter(chapter)
+
+        return book
+
     def _parse_outline(
         self,
         outline_text: str,
@@ -73,51 +166,125 @@ Generate the complete outline now.
             target_audience=target_audience
         )
 
-        lines = outline_text.strip().split('\n')
         current_chapter = None
         current_chapter_num = 0
-        in_sections = False
 
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
+        # lastgroup names the one alternative that matched, so each match
+        # costs a single group lookup instead of probing all three
+        for match in _OUTLINE_RE.finditer(outline_text):
+            kind = match.lastgroup
 
-            if line.startswith("Chapter "):
+            if kind == 'title':
                 if current_chapter:
                     book.add_chapter(current_chapter)
-                
+
                 current_chapter_num += 1
-                parts = line.split(":", 1)
-                title = parts[1].strip() if len(parts) > 1 else f"Chapter {current_chapter_num}"
                 current_chapter = Chapter(
-                    title=title,
+                    title=match.group('title').strip(),
                     number=current_chapter_num
                 )
-                in_sections = False
-
-            elif line.startswith("Description:") and current_chapter:
-                description = line.split(":", 1)[1].strip()
-                current_chapter.introduction = description
-                
-            elif line.startswith("Sections:"):
-                in_sections = True
-                
-            elif line.startswith("-") and current_chapter and in_sections:
-                section_title = line.lstrip("- ").strip()
+            elif current_chapter is None:
+                continue
+            elif kind == 'desc':
+                current_chapter.introduction = match.group('desc').strip()
+            else:
+                section_title = match.group('sect').lstrip("- ").strip()
                 if section_title:
-                    section = Section(title=section_title)
-                    current_chapter.add_section(section)
+                    current_chapter.add_section(Section(title=section_title))
 
         if current_chapter:
             book.add_chapter(current_chapter)
 
         return book
 
-    def expand_chapter(self, chapter: Chapter, detail_level: str = "medium") -> Chapter:
-        """Expand a chapter with more detailed sections"""
-        
-        prompt = f"""
+    def parse_outlines_batch(
+        self,
+        texts: List[str],
+        metas: List[Tuple[str, str, str]]
+    ) -> List[Book]:
+        """
+        Parse several outline texts in one regex scan
+
+        Replanning loops parse outlines one at a time, paying the
+        finditer setup and Python loop overhead per outline. Joining the
+        texts with a sentinel line lets the compiled pattern scan them
+        all at once; matches are routed to the right Book by position.
+
+        Args:
+            texts: Raw outline texts, one per book
+            metas: Matching (topic, programming_language, target_audience)
+                tuples used to seed each Book
+
+        Returns:
+            List of parsed Books in input order
+        """
+        books = [
+            Book(
+                title=f"Mastering {topic}",
+                author="AI Book Creator",
+                description=f"A comprehensive guide to {topic}",
+                programming_language=programming_language,
+                target_audience=target_audience
+            )
+            for topic, programming_language, target_audience in metas
+        ]
+        if not texts:
+            return books
+
+        sentinel = "\n\x1eBOOK\x1e\n"
+        joined = sentinel.join(texts)
+
+        # End offset of each text within the joined string, in order
+        boundaries = []
+        offset = 0
+        for text in texts:
+            offset += len(text)
+            boundaries.append(offset)
+            offset += len(sentinel)
+
+        book_index = 0
+        book = books[0]
+        current_chapter = None
+        current_chapter_num = 0
+
+        for match in _OUTLINE_RE.finditer(joined):
+            while match.start() > boundaries[book_index]:
+                if current_chapter:
+                    book.add_chapter(current_chapter)
+                book_index += 1
+                book = books[book_index]
+                current_chapter = None
+                current_chapter_num = 0
+
+            kind = match.lastgroup
+
+            if kind == 'title':
+                if current_chapter:
+                    book.add_chapter(current_chapter)
+
+                current_chapter_num += 1
+                current_chapter = Chapter(
+                    title=match.group('title').strip(),
+                    number=current_chapter_num
+                )
+            elif current_chapter is None:
+                continue
+            elif kind == 'desc':
+                current_chapter.introduction = match.group('desc').strip()
+            else:
+                section_title = match.group('sect').lstrip("- ").strip()
+                if section_title:
+                    current_chapter.add_section(Section(title=section_title))
+
+        if current_chapter:
+            book.add_chapter(current_chapter)
+
+        return books
+
+    def _expand_prompt(self, chapter: Chapter, detail_level: str) -> str:
+        """Build the expansion prompt for a chapter"""
+
+        return f"""
 Expand the following chapter outline with more detailed sections:
 
 Chapter: {chapter.title}
@@ -133,18 +300,73 @@ Format:
 ...
 """
 
-        response = self.llm_client.generate_text(prompt)
-        
-        # Parse new sections
-        new_sections = []
-        for line in response.strip().split('\n'):
-            line = line.strip()
-            if line.startswith("-"):
-                section_title = line.lstrip("- ").strip()
-                if section_title:
-                    new_sections.append(Section(title=section_title))
+    @staticmethod
+    def _parse_section_lines(response: str) -> list:
+        """Parse '- title' bullet lines into Section objects"""
+
+        return [
+            Section(title=title)
+            for match in _BULLET_RE.finditer(response)
+            if (title := match.group(1).lstrip("- ").strip())
+        ]
+
+    def expand_chapter(self, chapter: Chapter, detail_level: str = "medium") -> Chapter:
+        """Expand a chapter with more detailed sections"""
+
+        response = self.llm_client.generate_text(self._expand_prompt(chapter, detail_level))
+
+        new_sections = self._parse_section_lines(response)
+        if new_sections:
+            chapter.sections = new_sections
+
+        return chapter
+
+    async def aexpand_chapter(self, chapter: Chapter, detail_level: str = "medium") -> Chapter:
+        """Expand a chapter with more detailed sections asynchronously"""
 
+        response = await self.llm_client.generate_text_async(
+            self._expand_prompt(chapter, detail_level)
+        )
+
+        new_sections = self._parse_section_lines(response)
         if new_sections:
             chapter.sections = new_sections
 
         return chapter
+
+    async def aexpand_all(self, chapters: list, detail_level: str = "medium") -> list:
+        """
+        Expand several chapters concurrently on the event loop
+
+        Unlike expand_chapters this keeps interactive latency: all
+        expansion calls overlap instead of waiting on a batch window.
+        """
+        await asyncio.gather(
+            *(self.aexpand_chapter(chapter, detail_level) for chapter in chapters)
+        )
+        return chapters
+
+    def expand_chapters(self, chapters: list, detail_level: str = "medium") -> list:
+        """
+        Expand several chapters through one batched LLM submission
+
+        Expanding a whole outline chapter by chapter serializes one
+        round-trip per chapter; submitting all prompts together lets the
+        provider's batch endpoint (or the sequential fallback) process
+        them as a unit. Chapters are returned in input order.
+        """
+        if not chapters:
+            return chapters
+
+        requests = [
+            (None, self._expand_prompt(chapter, detail_level))
+            for chapter in chapters
+        ]
+        responses = self.llm_client.submit_batch(requests)
+
+        for chapter, response in zip(chapters, responses):
+            new_sections = self._parse_section_lines(response or "")
+            if new_sections:
+                chapter.sections = new_sections
+
+        return chapters
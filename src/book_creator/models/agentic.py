@@ -7,6 +7,7 @@ This module implements:
 - Book Blueprint for inter-agent communication
 """
 
+import sys
 from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any
 from enum import Enum
@@ -32,6 +33,27 @@ class LifecycleState(Enum):
     FAILED = "failed"       # Terminal failure state
 
 
+# Allowed lifecycle transitions (PRD Section 9.0), built once at import:
+# can_transition_to runs on every transition attempt and review/repair
+# loop, so it should not rebuild this table per call
+_ALLOWED_TRANSITIONS: Dict[LifecycleState, frozenset] = {
+    LifecycleState.INIT: frozenset({LifecycleState.INTERPRET, LifecycleState.FAILED}),
+    LifecycleState.INTERPRET: frozenset({LifecycleState.PLAN, LifecycleState.FAILED}),
+    LifecycleState.PLAN: frozenset({LifecycleState.WRITE, LifecycleState.FAILED}),
+    LifecycleState.WRITE: frozenset({LifecycleState.REVIEW, LifecycleState.FAILED}),
+    LifecycleState.REVIEW: frozenset(
+        {LifecycleState.FORMAT, LifecycleState.REPAIR, LifecycleState.FAILED}
+    ),
+    LifecycleState.REPAIR: frozenset({LifecycleState.REVIEW, LifecycleState.FAILED}),
+    LifecycleState.FORMAT: frozenset({LifecycleState.EXPORT, LifecycleState.FAILED}),
+    LifecycleState.EXPORT: frozenset({LifecycleState.COMPLETE, LifecycleState.FAILED}),
+    LifecycleState.COMPLETE: frozenset(),  # Terminal state
+    LifecycleState.FAILED: frozenset()  # Terminal state
+}
+
+_NO_TRANSITIONS: frozenset = frozenset()
+
+
 class ComplexityLevel(Enum):
     """Book and section complexity levels."""
     BEGINNER = "beginner"
@@ -48,7 +70,13 @@ class ReviewStatus(Enum):
     NEEDS_REPAIR = "needs_repair"
 
 
-@dataclass
+# Value -> member maps for the string coercions in from_dict; a plain
+# dict index skips the EnumMeta.__call__ dispatch on every lookup
+_COMPLEXITY_BY_VALUE = {member.value: member for member in ComplexityLevel}
+_REVIEW_STATUS_BY_VALUE = {member.value: member for member in ReviewStatus}
+
+
+@dataclass(slots=True)
 class UserPrompt:
     """
     User prompt for Agentic-First Mode.
@@ -95,7 +123,7 @@ class UserPrompt:
         """Create from dictionary."""
         complexity = None
         if data.get("complexity_level"):
-            complexity = ComplexityLevel(data["complexity_level"])
+            complexity = _COMPLEXITY_BY_VALUE[data["complexity_level"]]
         
         return cls(
             topic=data.get("topic", ""),
@@ -103,24 +131,34 @@ class UserPrompt:
             learning_outcome=data.get("learning_outcome", ""),
             complexity_level=complexity,
             book_length=data.get("book_length"),
-            tone=data.get("tone", "professional"),
-            output_format=data.get("output_format", "pdf"),
+            # Categorical fields repeat the same few values across every
+            # saved prompt; interning dedupes them and makes == an
+            # identity check
+            tone=sys.intern(data.get("tone", "professional")),
+            output_format=sys.intern(data.get("output_format", "pdf")),
             region_context=data.get("region_context", ""),
             include_exercises=data.get("include_exercises", True),
             include_code_examples=data.get("include_code_examples", True),
-            programming_language=data.get("programming_language", "")
+            programming_language=sys.intern(data.get("programming_language", ""))
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class LearningObjective:
     """A learning objective for the book or chapter."""
     description: str
     chapter_number: Optional[int] = None
     bloom_level: str = "understand"  # remember, understand, apply, analyze, evaluate, create
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "description": self.description,
+            "bloom_level": self.bloom_level
+        }
+
 
-@dataclass
+@dataclass(slots=True)
 class ChapterBlueprint:
     """
     Blueprint for a chapter in the book.
@@ -132,61 +170,84 @@ class ChapterBlueprint:
     description: str
     complexity_level: ComplexityLevel
     estimated_length: int  # words
-    section_titles: List[str] = field(default_factory=list)
-    learning_objectives: List[LearningObjective] = field(default_factory=list)
-    key_concepts: List[str] = field(default_factory=list)
-    prerequisites: List[str] = field(default_factory=list)  # Concepts from previous chapters
-    
+    # List fields are excluded from __eq__ so blueprint comparisons
+    # (dedup, membership checks) stay O(1) on the scalar fields instead
+    # of walking every nested element
+    section_titles: List[str] = field(default_factory=list, compare=False)
+    learning_objectives: List[LearningObjective] = field(default_factory=list, compare=False)
+    key_concepts: List[str] = field(default_factory=list, compare=False)
+    prerequisites: List[str] = field(default_factory=list, compare=False)  # Concepts from previous chapters
+
     # Review tracking
     review_status: ReviewStatus = ReviewStatus.PENDING
-    review_notes: List[str] = field(default_factory=list)
-    
+    review_notes: List[str] = field(default_factory=list, compare=False)
+
+    # Serialization memo: bumped on every field assignment so to_dict
+    # can reuse the last dict while the blueprint is unchanged
+    _version: int = field(default=0, init=False, repr=False, compare=False)
+    _dict_cache: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if not name.startswith('_'):
+            try:
+                object.__setattr__(self, '_version', self._version + 1)
+            except AttributeError:
+                pass  # still inside __init__
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
-        return {
+        # The agentic lifecycle serializes state after every transition;
+        # skip rebuilding when nothing was assigned since the last call.
+        # (In-place mutation of list fields is not tracked.)
+        if self._dict_cache is not None and self._dict_cache[0] == self._version:
+            return self._dict_cache[1]
+
+        result = {
             "number": self.number,
             "title": self.title,
             "description": self.description,
             "complexity_level": self.complexity_level.value,
             "estimated_length": self.estimated_length,
             "section_titles": self.section_titles,
-            "learning_objectives": [
-                {"description": obj.description, "bloom_level": obj.bloom_level}
-                for obj in self.learning_objectives
-            ],
+            "learning_objectives": [obj.to_dict() for obj in self.learning_objectives],
             "key_concepts": self.key_concepts,
             "prerequisites": self.prerequisites,
             "review_status": self.review_status.value,
             "review_notes": self.review_notes
         }
-    
+        object.__setattr__(self, '_dict_cache', (self._version, result))
+        return result
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'ChapterBlueprint':
         """Create from dictionary."""
         objectives = [
             LearningObjective(
                 description=obj.get("description", ""),
-                bloom_level=obj.get("bloom_level", "understand")
+                # One of six Bloom taxonomy levels; intern so dozens of
+                # objectives share the same string objects
+                bloom_level=sys.intern(obj.get("bloom_level", "understand"))
             )
             for obj in data.get("learning_objectives", [])
         ]
-        
+
         return cls(
             number=data.get("number", 0),
             title=data.get("title", ""),
             description=data.get("description", ""),
-            complexity_level=ComplexityLevel(data.get("complexity_level", "intermediate")),
+            complexity_level=_COMPLEXITY_BY_VALUE[data.get("complexity_level", "intermediate")],
             estimated_length=data.get("estimated_length", 2000),
             section_titles=data.get("section_titles", []),
             learning_objectives=objectives,
             key_concepts=data.get("key_concepts", []),
             prerequisites=data.get("prerequisites", []),
-            review_status=ReviewStatus(data.get("review_status", "pending")),
+            review_status=_REVIEW_STATUS_BY_VALUE[data.get("review_status", "pending")],
             review_notes=data.get("review_notes", [])
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class BookBlueprint:
     """
     Blueprint for the entire book.
@@ -200,12 +261,14 @@ class BookBlueprint:
     
     # Inferred from user prompt
     target_audience: str = ""
-    assumed_prior_knowledge: List[str] = field(default_factory=list)
+    # As in ChapterBlueprint, the list fields stay out of __eq__ so
+    # comparisons reduce to the scalar fields
+    assumed_prior_knowledge: List[str] = field(default_factory=list, compare=False)
     complexity_level: ComplexityLevel = ComplexityLevel.INTERMEDIATE
-    
+
     # Pedagogical structure
-    learning_objectives: List[LearningObjective] = field(default_factory=list)
-    chapters: List[ChapterBlueprint] = field(default_factory=list)
+    learning_objectives: List[LearningObjective] = field(default_factory=list, compare=False)
+    chapters: List[ChapterBlueprint] = field(default_factory=list, compare=False)
     
     # Estimated metrics
     total_chapters: int = 10
@@ -221,20 +284,41 @@ class BookBlueprint:
     
     # Tracking
     created_at: datetime = field(default_factory=datetime.now)
-    
+
+    # Serialization memo: own version plus the chapter versions seen at
+    # cache time, so a mutated ChapterBlueprint invalidates the parent
+    _version: int = field(default=0, init=False, repr=False, compare=False)
+    _dict_cache: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if not name.startswith('_'):
+            try:
+                object.__setattr__(self, '_version', self._version + 1)
+            except AttributeError:
+                pass  # still inside __init__
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
-        return {
+        # Re-serialized after every lifecycle transition; an integer
+        # comparison per chapter replaces the full rebuild when nothing
+        # changed. (In-place mutation of list fields is not tracked.)
+        chapter_versions = tuple(ch._version for ch in self.chapters)
+        if (
+            self._dict_cache is not None
+            and self._dict_cache[0] == self._version
+            and self._dict_cache[1] == chapter_versions
+        ):
+            return self._dict_cache[2]
+
+        result = {
             "title": self.title,
             "author": self.author,
             "description": self.description,
             "target_audience": self.target_audience,
             "assumed_prior_knowledge": self.assumed_prior_knowledge,
             "complexity_level": self.complexity_level.value,
-            "learning_objectives": [
-                {"description": obj.description, "bloom_level": obj.bloom_level}
-                for obj in self.learning_objectives
-            ],
+            "learning_objectives": [obj.to_dict() for obj in self.learning_objectives],
             "chapters": [ch.to_dict() for ch in self.chapters],
             "total_chapters": self.total_chapters,
             "estimated_total_words": self.estimated_total_words,
@@ -246,18 +330,20 @@ class BookBlueprint:
             "include_code_examples": self.include_code_examples,
             "created_at": self.created_at.isoformat()
         }
-    
+        object.__setattr__(self, '_dict_cache', (self._version, chapter_versions, result))
+        return result
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'BookBlueprint':
         """Create from dictionary."""
         objectives = [
             LearningObjective(
                 description=obj.get("description", ""),
-                bloom_level=obj.get("bloom_level", "understand")
+                bloom_level=sys.intern(obj.get("bloom_level", "understand"))
             )
             for obj in data.get("learning_objectives", [])
         ]
-        
+
         chapters = [
             ChapterBlueprint.from_dict(ch)
             for ch in data.get("chapters", [])
@@ -277,22 +363,22 @@ class BookBlueprint:
             description=data.get("description", ""),
             target_audience=data.get("target_audience", ""),
             assumed_prior_knowledge=data.get("assumed_prior_knowledge", []),
-            complexity_level=ComplexityLevel(data.get("complexity_level", "intermediate")),
+            complexity_level=_COMPLEXITY_BY_VALUE[data.get("complexity_level", "intermediate")],
             learning_objectives=objectives,
             chapters=chapters,
             total_chapters=data.get("total_chapters", 10),
             estimated_total_words=data.get("estimated_total_words", 20000),
             estimated_pages=data.get("estimated_pages", 100),
-            tone=data.get("tone", "professional"),
-            output_format=data.get("output_format", "pdf"),
-            programming_language=data.get("programming_language", ""),
+            tone=sys.intern(data.get("tone", "professional")),
+            output_format=sys.intern(data.get("output_format", "pdf")),
+            programming_language=sys.intern(data.get("programming_language", "")),
             include_exercises=data.get("include_exercises", True),
             include_code_examples=data.get("include_code_examples", True),
             created_at=created_at
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ReviewResult:
     """Result from the Editor Agent review."""
     passed: bool
@@ -320,7 +406,7 @@ class ReviewResult:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class AgenticState:
     """
     Current state of the agentic book generation process.
@@ -365,20 +451,7 @@ class AgenticState:
         - REPAIR → REVIEW
         - FORMAT → EXPORT
         """
-        allowed_transitions = {
-            LifecycleState.INIT: [LifecycleState.INTERPRET, LifecycleState.FAILED],
-            LifecycleState.INTERPRET: [LifecycleState.PLAN, LifecycleState.FAILED],
-            LifecycleState.PLAN: [LifecycleState.WRITE, LifecycleState.FAILED],
-            LifecycleState.WRITE: [LifecycleState.REVIEW, LifecycleState.FAILED],
-            LifecycleState.REVIEW: [LifecycleState.FORMAT, LifecycleState.REPAIR, LifecycleState.FAILED],
-            LifecycleState.REPAIR: [LifecycleState.REVIEW, LifecycleState.FAILED],
-            LifecycleState.FORMAT: [LifecycleState.EXPORT, LifecycleState.FAILED],
-            LifecycleState.EXPORT: [LifecycleState.COMPLETE, LifecycleState.FAILED],
-            LifecycleState.COMPLETE: [],  # Terminal state
-            LifecycleState.FAILED: []  # Terminal state
-        }
-        
-        return new_state in allowed_transitions.get(self.current_state, [])
+        return new_state in _ALLOWED_TRANSITIONS.get(self.current_state, _NO_TRANSITIONS)
     
     def transition_to(self, new_state: LifecycleState) -> bool:
         """Transition to a new state if allowed."""
@@ -389,6 +462,22 @@ class AgenticState:
             return True
         return False
     
+    def reset(self) -> None:
+        """Return the state to its freshly-constructed form for reuse."""
+        self.current_state = LifecycleState.INIT
+        self.user_prompt = None
+        self.raw_prompt = ""
+        self.blueprint = None
+        self.review_results = []
+        self.chapters_written = 0
+        self.chapters_reviewed = 0
+        self.repair_iterations = 0
+        self.max_repair_iterations = 3
+        self.output_path = ""
+        self.started_at = datetime.now()
+        self.completed_at = None
+        self.errors = []
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
         return {
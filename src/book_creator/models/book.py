@@ -7,8 +7,22 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime
 import json
 
+try:
+    import orjson
+except ImportError:  # optional accelerator, stdlib json works fine without it
+    orjson = None
 
-@dataclass
+try:
+    import msgpack
+except ImportError:  # optional; JSON stays the default interchange format
+    msgpack = None
+
+# Books at least this many chapters long are saved chapter by chapter
+# instead of materializing the whole JSON document in memory
+_STREAM_CHAPTER_THRESHOLD = 32
+
+
+@dataclass(slots=True)
 class Section:
     """Represents a section within a chapter"""
     title: str
@@ -55,7 +69,7 @@ class Section:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Chapter:
     """Represents a chapter in the book"""
     title: str
@@ -93,7 +107,7 @@ class Chapter:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Book:
     """Represents a complete book"""
     title: str
@@ -107,17 +121,28 @@ class Book:
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
 
+    # Chapter lookup index; review/repair loops hit get_chapter often
+    _by_number: Dict[int, Chapter] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        self._by_number = {chapter.number: chapter for chapter in self.chapters}
+
     def add_chapter(self, chapter: Chapter):
         """Add a chapter to the book"""
         self.chapters.append(chapter)
+        self._by_number[chapter.number] = chapter
         self.updated_at = datetime.now()
 
     def get_chapter(self, number: int) -> Optional[Chapter]:
         """Get a chapter by number"""
-        for chapter in self.chapters:
-            if chapter.number == number:
-                return chapter
-        return None
+        chapter = self._by_number.get(number)
+        if chapter is not None and chapter.number == number:
+            return chapter
+        # Chapters were renumbered or the list replaced; rebuild the index
+        self._by_number = {c.number: c for c in self.chapters}
+        return self._by_number.get(number)
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert book to dictionary"""
@@ -136,8 +161,26 @@ class Book:
 
     def to_json(self) -> str:
         """Convert book to JSON string"""
+        if orjson is not None:
+            return self._dump_bytes().decode("utf-8")
         return json.dumps(self.to_dict(), indent=2)
 
+    def _dump_bytes(self) -> bytes:
+        """Serialize the dataclass graph straight to JSON bytes via orjson"""
+        # orjson walks dataclass fields natively, skipping the
+        # intermediate dict tree to_dict would build
+        return orjson.dumps(self, option=orjson.OPT_INDENT_2, default=str)
+
+    @staticmethod
+    def _parse_timestamp(value: Optional[str]) -> datetime:
+        """Parse an ISO timestamp, defaulting to now without a format/parse round-trip"""
+        if value:
+            try:
+                return datetime.fromisoformat(value)
+            except (ValueError, TypeError):
+                pass
+        return datetime.now()
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Book':
         """Create book from dictionary"""
@@ -150,23 +193,120 @@ class Book:
             programming_language=data.get("programming_language", ""),
             chapters=[Chapter.from_dict(c) for c in data.get("chapters", [])],
             metadata=data.get("metadata", {}),
-            created_at=datetime.fromisoformat(data.get("created_at", datetime.now().isoformat())),
-            updated_at=datetime.fromisoformat(data.get("updated_at", datetime.now().isoformat()))
+            created_at=cls._parse_timestamp(data.get("created_at")),
+            updated_at=cls._parse_timestamp(data.get("updated_at"))
         )
 
     @classmethod
     def from_json(cls, json_str: str) -> 'Book':
         """Create book from JSON string"""
-        data = json.loads(json_str)
+        data = orjson.loads(json_str) if orjson is not None else json.loads(json_str)
         return cls.from_dict(data)
 
+    def to_msgpack(self) -> bytes:
+        """
+        Serialize the book to msgpack bytes
+
+        The binary format is several times smaller and faster to encode
+        than JSON, which matters when books move between pipeline
+        services or in and out of caches.
+        """
+        if msgpack is None:
+            raise ImportError("msgpack is not installed. Install with: pip install msgpack")
+        return msgpack.packb(self.to_dict(), use_bin_type=True)
+
+    @classmethod
+    def from_msgpack(cls, data: bytes) -> 'Book':
+        """Create book from msgpack bytes"""
+        if msgpack is None:
+            raise ImportError("msgpack is not installed. Install with: pip install msgpack")
+        return cls.from_dict(msgpack.unpackb(data, raw=False))
+
     def save(self, filepath: str):
         """Save book to JSON file"""
+        if len(self.chapters) >= _STREAM_CHAPTER_THRESHOLD:
+            self.stream_save(filepath)
+            return
+        if orjson is not None:
+            # Write the serialized bytes directly, skipping the
+            # decode/re-encode round-trip of the text path
+            with open(filepath, 'wb') as f:
+                f.write(self._dump_bytes())
+            return
         with open(filepath, 'w', encoding='utf-8') as f:
             f.write(self.to_json())
 
+    def stream_save(self, filepath: str):
+        """
+        Save book to JSON file one chapter at a time
+
+        save() serializes the whole document before the first byte hits
+        disk, so peak memory is roughly twice the book size. This writes
+        the scalar fields and then each chapter's JSON individually,
+        keeping at most one chapter's serialization in memory. Field
+        order matches to_dict, so load() reads the result unchanged.
+        """
+        if orjson is not None:
+            dumps = orjson.dumps
+        else:
+            def dumps(obj):
+                return json.dumps(obj).encode('utf-8')
+
+        with open(filepath, 'wb') as f:
+            f.write(b'{"title":' + dumps(self.title))
+            f.write(b',"author":' + dumps(self.author))
+            f.write(b',"description":' + dumps(self.description))
+            f.write(b',"preface":' + dumps(self.preface))
+            f.write(b',"target_audience":' + dumps(self.target_audience))
+            f.write(b',"programming_language":' + dumps(self.programming_language))
+            f.write(b',"chapters":[')
+            for i, chapter in enumerate(self.chapters):
+                if i:
+                    f.write(b',')
+                f.write(dumps(chapter.to_dict()))
+            f.write(b']')
+            f.write(b',"metadata":' + dumps(self.metadata))
+            f.write(b',"created_at":' + dumps(self.created_at.isoformat()))
+            f.write(b',"updated_at":' + dumps(self.updated_at.isoformat()))
+            f.write(b'}')
+
     @classmethod
     def load(cls, filepath: str) -> 'Book':
         """Load book from JSON file"""
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return cls.from_json(f.read())
+        # Parse the raw bytes directly; orjson validates UTF-8 itself,
+        # so there is no separate decode pass over the file
+        with open(filepath, 'rb') as f:
+            raw = f.read()
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        return cls.from_dict(data)
+
+    @classmethod
+    def load_metadata(cls, filepath: str) -> Dict[str, Any]:
+        """
+        Load only book metadata and chapter structure from a JSON file
+
+        Returns the top-level book fields plus a "chapters" list of
+        {number, title, section_count} entries, without building the full
+        object graph of sections, code examples and exercises. Intended
+        for summary views where loading all content would be wasteful.
+        """
+        with open(filepath, 'rb') as f:
+            data = orjson.loads(f.read()) if orjson is not None else json.load(f)
+
+        return {
+            "title": data.get("title", ""),
+            "author": data.get("author", ""),
+            "description": data.get("description", ""),
+            "target_audience": data.get("target_audience", ""),
+            "programming_language": data.get("programming_language", ""),
+            "created_at": data.get("created_at", ""),
+            "updated_at": data.get("updated_at", ""),
+            "chapters": [
+                {
+                    "number": c.get("number", 0),
+                    "title": c.get("title", ""),
+                    "section_count": len(c.get("sections", []))
+                }
+                for c in data.get("chapters", [])
+            ]
+        }
@@ -9,6 +9,14 @@ and escape sequences properly using json.JSONDecoder.
 import json
 from typing import Optional
 
+try:
+    import orjson
+except ImportError:  # optional accelerator, stdlib json works fine without it
+    orjson = None
+
+# JSONDecoder is stateless; one instance serves every call
+_DECODER = json.JSONDecoder()
+
 
 def extract_json_object(text: str) -> Optional[dict]:
     """
@@ -26,10 +34,19 @@ def extract_json_object(text: str) -> Optional[dict]:
     start = text.find('{')
     if start == -1:
         return None
-    
-    decoder = json.JSONDecoder()
+
+    # Fast path: when the JSON runs to the end of the text, orjson
+    # parses it in native code
+    if orjson is not None:
+        try:
+            obj = orjson.loads(text[start:] if start else text)
+            return obj if isinstance(obj, dict) else None
+        except orjson.JSONDecodeError:
+            pass
+
     try:
-        obj, _ = decoder.raw_decode(text[start:])
+        # raw_decode's idx argument avoids copying the tail of the text
+        obj, _ = _DECODER.raw_decode(text, start)
         if isinstance(obj, dict):
             return obj
         return None
@@ -53,10 +70,19 @@ def extract_json_array(text: str) -> Optional[list]:
     start = text.find('[')
     if start == -1:
         return None
-    
-    decoder = json.JSONDecoder()
+
+    # Fast path: when the JSON runs to the end of the text, orjson
+    # parses it in native code
+    if orjson is not None:
+        try:
+            arr = orjson.loads(text[start:] if start else text)
+            return arr if isinstance(arr, list) else None
+        except orjson.JSONDecodeError:
+            pass
+
     try:
-        arr, _ = decoder.raw_decode(text[start:])
+        # raw_decode's idx argument avoids copying the tail of the text
+        arr, _ = _DECODER.raw_decode(text, start)
         if isinstance(arr, list):
             return arr
         return None
@@ -5,13 +5,68 @@ This module provides intelligent caching for LLM responses to reduce API costs
 and improve performance by 10-100x for repeated or similar queries.
 """
 
+import asyncio
 import hashlib
 import json
 import os
+import struct
+import threading
+from collections import OrderedDict
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 import logging
 
+try:
+    import numpy as np
+except ImportError:  # ships with sentence-transformers; fall back to pure Python
+    np = None
+
+try:
+    import orjson
+except ImportError:  # optional accelerator, stdlib json works fine without it
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # optional accelerator; payloads stay uncompressed without it
+    zstandard = None
+
+# Leading magic of a Zstandard frame, used to tell compressed payloads
+# from legacy plain-JSON entries on read
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def _dumps(obj) -> Any:
+    """Serialize a cache payload; orjson skips ASCII-escaping the floats"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj)
+
+
+def _loads(data) -> Any:
+    """Deserialize a cache payload (the output stays plain JSON either way)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# Unit-vector components lie in [-1, 1], so the in-process embedding
+# matrix is stored as int8 at this fixed scale: a quarter of the float32
+# footprint per similarity sweep, at a worst-case dot-product error far
+# below the similarity threshold's resolution
+_QUANT_SCALE = 127.0
+
+# Prompt embeddings memoized per process; a miss followed by set() would
+# otherwise run the same transformer forward pass twice
+_EMBEDDING_LRU_MAX = 4096
+
+# Cap for the in-memory fallback cache used when Redis is unavailable;
+# long sessions must not grow it without bound
+_MEMORY_CACHE_MAX = 10000
+
+# Access-frequency counts are halved after this many touches so the
+# admission policy tracks recent popularity, not all-time totals
+_FREQ_AGE_INTERVAL = 10000
+
 
 class LLMCache:
     """
@@ -42,11 +97,42 @@ class LLMCache:
         self.redis_url = redis_url or os.getenv("REDIS_URL", "redis://localhost:6379")
         self.ttl_seconds = ttl_days * 24 * 3600
         self.similarity_threshold = similarity_threshold
+        # LLM_CACHE_SEMANTIC=0 turns semantic matching off without code
+        # changes, e.g. for exact-match-only deployments
+        if os.getenv("LLM_CACHE_SEMANTIC", "1") == "0":
+            enable_semantic = False
         self.enable_semantic = enable_semantic
         self.logger = logging.getLogger(__name__)
         
         self._redis_client = None
         self._embeddings_model = None
+        self._emb_model_name = None
+        # Guards the lazy model load below; get/set run on worker
+        # threads (asyncio.to_thread, shared get_cache() instance), so
+        # two first callers must not both pay the multi-second load
+        self._model_lock = threading.Lock()
+        # In-process mirror of the semantic entries: one (N, d) matrix of
+        # unit vectors plus the parallel Redis keys, so a lookup is a
+        # single matrix-vector product instead of a SCAN+GET per entry
+        self._emb_matrix = None
+        self._emb_ids: List[str] = []
+        # Embeddings already computed for a prompt, LRU-bounded: get()
+        # and the set() that follows a miss share one forward pass
+        self._emb_lru: OrderedDict = OrderedDict()
+        # Whether the server-side RediSearch vector index is usable;
+        # None means not yet probed
+        self._vector_index_ready: Optional[bool] = None
+        # Aged access counts backing the TinyLFU-style admission check
+        # for the in-memory fallback cache
+        self._freq: Dict[str, int] = {}
+        self._freq_ops = 0
+        # Reused compressor/decompressor state for payload compression
+        if zstandard is not None:
+            self._zstd_compressor = zstandard.ZstdCompressor(level=3)
+            self._zstd_decompressor = zstandard.ZstdDecompressor()
+        else:
+            self._zstd_compressor = None
+            self._zstd_decompressor = None
         self._stats = {
             "hits": 0,
             "misses": 0,
@@ -60,7 +146,9 @@ class LLMCache:
         """Initialize Redis and embeddings model if available"""
         try:
             import redis
-            self._redis_client = redis.from_url(self.redis_url, decode_responses=True)
+            # Responses stay raw bytes so payloads can be compressed;
+            # _decode_payload handles both compressed and legacy entries
+            self._redis_client = redis.from_url(self.redis_url, decode_responses=False)
             # Test connection
             self._redis_client.ping()
             self.logger.info(f"Redis cache connected: {self.redis_url}")
@@ -68,58 +156,190 @@ class LLMCache:
             self.logger.warning("Redis not installed. Install with: pip install redis")
             self.logger.info("Falling back to in-memory cache")
             self._redis_client = None
-            self._memory_cache = {}
+            self._memory_cache = OrderedDict()
         except Exception as e:
             self.logger.warning(f"Redis connection failed: {e}")
             self.logger.info("Falling back to in-memory cache")
             self._redis_client = None
-            self._memory_cache = {}
-        
-        # Initialize embeddings for semantic caching
-        if self.enable_semantic:
+            self._memory_cache = OrderedDict()
+
+    def _load_embeddings_model(self):
+        """
+        Load the embeddings model for semantic caching on first use
+
+        Loading in __init__ would cost seconds and hundreds of MB even
+        when only exact-match caching is ever exercised; deferring to
+        the first _get_embedding call keeps that off the startup path.
+        A static lookup-and-pool model is preferred when installed:
+        cache lookups sit on the critical path of every LLM call, and
+        static embeddings cut encode latency by an order of magnitude
+        over the transformer while remaining accurate enough for
+        near-duplicate prompt matching.
+        """
+        if self._embeddings_model is not None or not self.enable_semantic:
+            return self._embeddings_model
+        # Double-checked: the unlocked test above keeps the loaded-model
+        # fast path lock-free, the re-check under the lock ensures only
+        # one of several concurrent first callers runs the load
+        with self._model_lock:
+            if self._embeddings_model is not None or not self.enable_semantic:
+                return self._embeddings_model
+            try:
+                from model2vec import StaticModel
+                self._embeddings_model = StaticModel.from_pretrained(
+                    'minishlab/M2V_base_output'
+                )
+                self._emb_model_name = 'M2V_base_output'
+                self.logger.info("Semantic caching enabled (model2vec M2V_base_output)")
+                return self._embeddings_model
+            except ImportError:
+                pass
             try:
                 from sentence_transformers import SentenceTransformer
                 self._embeddings_model = SentenceTransformer('all-MiniLM-L6-v2')
+                self._emb_model_name = 'all-MiniLM-L6-v2'
                 self.logger.info("Semantic caching enabled (all-MiniLM-L6-v2)")
             except ImportError:
                 self.logger.warning("sentence-transformers not installed. Install with: pip install sentence-transformers")
                 self.logger.info("Semantic caching disabled")
                 self.enable_semantic = False
-    
+            return self._embeddings_model
+
+    def _encode_payload(self, obj: Dict[str, Any]) -> bytes:
+        """Serialize a cache payload, zstd-compressing it when available"""
+        data = _dumps(obj)
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        if self._zstd_compressor is not None:
+            return self._zstd_compressor.compress(data)
+        return data
+
+    def _decode_payload(self, raw) -> Dict[str, Any]:
+        """Deserialize a cache payload, decompressing zstd frames by magic"""
+        if (self._zstd_decompressor is not None
+                and isinstance(raw, bytes)
+                and raw[:4] == _ZSTD_MAGIC):
+            raw = self._zstd_decompressor.decompress(raw)
+        return _loads(raw)
+
     def _hash_prompt(self, prompt: str, params: Dict[str, Any]) -> str:
         """Generate hash key for exact matching"""
-        # Include relevant parameters in hash
-        key_data = {
-            "prompt": prompt,
-            "temperature": params.get("temperature", 0.7),
-            "model": params.get("model", ""),
-            "max_tokens": params.get("max_tokens", 2000)
-        }
-        key_str = json.dumps(key_data, sort_keys=True)
-        return hashlib.sha256(key_str.encode()).hexdigest()
+        # The key only needs to be a stable map key, not cryptographic:
+        # blake2b is faster than SHA-256 in software, and feeding the
+        # fields directly skips a json.dumps over prompts that can run
+        # to tens of KB
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(prompt.encode())
+        digest.update(struct.pack(
+            '<dI',
+            params.get("temperature", 0.7),
+            params.get("max_tokens", 2000)
+        ))
+        digest.update(params.get("model", "").encode())
+        return digest.hexdigest()
     
-    def _get_embedding(self, text: str) -> Optional[List[float]]:
-        """Get embedding vector for semantic similarity"""
-        if not self.enable_semantic or not self._embeddings_model:
+    def _get_embedding(self, text: str):
+        """Get embedding vector for semantic similarity, memoized per prompt"""
+        if not self.enable_semantic or not self._load_embeddings_model():
             return None
-        
+
+        lru_key = hashlib.blake2b(text.encode(), digest_size=16).digest()
+        cached = self._emb_lru.get(lru_key)
+        if cached is not None:
+            self._emb_lru.move_to_end(lru_key)
+            return cached
+
         try:
-            embedding = self._embeddings_model.encode(text)
-            return embedding.tolist()
+            embedding = self._finish_embedding(self._embeddings_model.encode(text))
         except Exception as e:
             print(f"⚠ Embedding generation failed: {e}")
             return None
-    
-    def _cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
+
+        self._memoize_embedding(lru_key, embedding)
+        return embedding
+
+    @staticmethod
+    def _finish_embedding(embedding):
+        """Normalize a raw model vector into the cache's storage form"""
+        if np is not None:
+            # Keep the ndarray so similarity runs in C; float32 is
+            # what MiniLM emits and halves the memory of float64.
+            # L2-normalizing here means cosine similarity against
+            # other unit vectors is a bare dot product later.
+            embedding = embedding.astype(np.float32, copy=False)
+            norm = np.sqrt(np.vdot(embedding, embedding))
+            if norm:
+                embedding = embedding / norm
+            return embedding
+        return embedding.tolist()
+
+    def _memoize_embedding(self, lru_key: bytes, embedding) -> None:
+        """Store an embedding in the per-prompt LRU, evicting past the cap"""
+        self._emb_lru[lru_key] = embedding
+        if len(self._emb_lru) > _EMBEDDING_LRU_MAX:
+            self._emb_lru.popitem(last=False)
+
+    def prime_embeddings(self, prompts: List[str]) -> None:
+        """
+        Batch-encode prompts into the embedding memo
+
+        Encoding strings one at a time wastes the transformer's batch
+        throughput. Bulk workflows (chapter drafting, replans) can prime
+        all their prompts here in one encode call — sorted by length so
+        the tokenizer pads each batch minimally — and every subsequent
+        get/set resolves its embedding from the LRU.
+        """
+        if not self.enable_semantic or not self._load_embeddings_model():
+            return
+
+        pending = []
+        seen = set()
+        for prompt in prompts:
+            lru_key = hashlib.blake2b(prompt.encode(), digest_size=16).digest()
+            if lru_key in self._emb_lru or lru_key in seen:
+                continue
+            seen.add(lru_key)
+            pending.append((prompt, lru_key))
+        if not pending:
+            return
+
+        pending.sort(key=lambda item: len(item[0]))
+        try:
+            vectors = self._embeddings_model.encode(
+                [prompt for prompt, _ in pending], batch_size=32
+            )
+        except Exception as e:
+            print(f"⚠ Batch embedding generation failed: {e}")
+            return
+
+        for (_, lru_key), vector in zip(pending, vectors):
+            self._memoize_embedding(lru_key, self._finish_embedding(vector))
+
+    @staticmethod
+    def _dot(vec1, vec2) -> float:
+        """Dot product of two unit vectors (equals their cosine similarity)"""
+        return float(np.dot(vec1, vec2))
+
+    def _cosine_similarity(self, vec1, vec2) -> float:
         """Calculate cosine similarity between two vectors"""
+        if np is not None:
+            a = np.asarray(vec1, dtype=np.float32)
+            b = np.asarray(vec2, dtype=np.float32)
+            # Single sqrt over the product of squared magnitudes; the
+            # whole reduction stays in vectorized C code
+            denominator = np.sqrt(np.vdot(a, a) * np.vdot(b, b))
+            if denominator == 0:
+                return 0.0
+            return float(np.dot(a, b) / denominator)
+
         import math
         dot_product = sum(a * b for a, b in zip(vec1, vec2))
         magnitude1 = math.sqrt(sum(a * a for a in vec1))
         magnitude2 = math.sqrt(sum(b * b for b in vec2))
-        
+
         if magnitude1 == 0 or magnitude2 == 0:
             return 0.0
-        
+
         return dot_product / (magnitude1 * magnitude2)
     
     def get(self, prompt: str, params: Dict[str, Any]) -> Optional[str]:
@@ -141,16 +361,18 @@ class LLMCache:
                 cached = self._redis_client.get(f"llm:exact:{cache_key}")
                 if cached:
                     self._stats["hits"] += 1
-                    cached_data = json.loads(cached)
+                    cached_data = self._decode_payload(cached)
                     print(f"✓ Cache hit (exact) - saved ${cached_data.get('cost', 0):.4f}")
                     return cached_data["response"]
             except Exception as e:
                 print(f"⚠ Cache retrieval error: {e}")
         else:
             # In-memory cache
+            self._touch_freq(cache_key)
             if cache_key in self._memory_cache:
                 self._stats["hits"] += 1
                 cached_data = self._memory_cache[cache_key]
+                self._memory_cache.move_to_end(cache_key)
                 print(f"✓ Cache hit (memory) - saved ${cached_data.get('cost', 0):.4f}")
                 return cached_data["response"]
         
@@ -164,49 +386,183 @@ class LLMCache:
         self._stats["misses"] += 1
         return None
     
+    def _touch_freq(self, cache_key: str) -> None:
+        """Record an access for the admission policy, aging counts periodically"""
+        self._freq[cache_key] = self._freq.get(cache_key, 0) + 1
+        self._freq_ops += 1
+        if self._freq_ops >= _FREQ_AGE_INTERVAL:
+            self._freq_ops = 0
+            self._freq = {
+                key: count // 2 for key, count in self._freq.items() if count > 1
+            }
+
+    def _remember_embedding(self, key: str, vector) -> None:
+        """Append a unit vector and its Redis key to the in-process matrix"""
+        row = np.clip(
+            np.round(vector * _QUANT_SCALE), -127, 127
+        ).astype(np.int8).reshape(1, -1)
+        if self._emb_matrix is None:
+            self._emb_matrix = row
+        else:
+            self._emb_matrix = np.vstack((self._emb_matrix, row))
+        self._emb_ids.append(key)
+
     def _find_similar(self, prompt: str, params: Dict[str, Any]) -> Optional[str]:
         """Find semantically similar cached response"""
         if not self._redis_client:
             return None  # Semantic search only works with Redis
-        
+
         query_embedding = self._get_embedding(prompt)
-        if not query_embedding:
+        if query_embedding is None or not len(query_embedding):
             return None
-        
+
         try:
-            # Scan for semantic keys (limited to last 100 for performance)
-            keys = list(self._redis_client.scan_iter("llm:semantic:*", count=100))
-            
-            best_match = None
-            best_similarity = 0.0
-            
-            for key in keys[:100]:  # Limit search for performance
-                cached = self._redis_client.get(key)
-                if not cached:
-                    continue
-                
-                cached_data = json.loads(cached)
-                cached_embedding = cached_data.get("embedding")
-                
-                if not cached_embedding:
-                    continue
-                
-                similarity = self._cosine_similarity(query_embedding, cached_embedding)
-                
-                if similarity > best_similarity and similarity >= self.similarity_threshold:
-                    # Check if parameters match
-                    if (params.get("temperature") == cached_data.get("temperature") and
-                        params.get("model") == cached_data.get("model")):
-                        best_similarity = similarity
-                        best_match = cached_data["response"]
-            
-            if best_match:
-                print(f"✓ Cache hit (semantic, {best_similarity:.2%} similar)")
-                return best_match
-                
+            if np is not None and self._ensure_vector_index(len(query_embedding)):
+                return self._search_vector_index(query_embedding, params)
+            if np is not None and self._emb_ids:
+                return self._search_matrix(query_embedding, params)
+            return self._scan_redis(query_embedding, params)
         except Exception as e:
             print(f"⚠ Semantic search error: {e}")
-        
+
+        return None
+
+    def _ensure_vector_index(self, dim: int) -> bool:
+        """
+        Probe for a server-side vector index, creating it on first use
+
+        RediSearch 2.4+ can answer the whole similarity query with one
+        FT.SEARCH against an HNSW index, replacing the client-side
+        scan/decode/score loop. The probe result is remembered, so
+        servers without the module pay for it exactly once.
+        """
+        if self._vector_index_ready is not None:
+            return self._vector_index_ready
+        try:
+            self._redis_client.execute_command("FT.INFO", "idx:llm")
+            self._vector_index_ready = True
+        except Exception:
+            try:
+                self._redis_client.execute_command(
+                    "FT.CREATE", "idx:llm", "ON", "HASH",
+                    "PREFIX", "1", "llm:semantic:",
+                    "SCHEMA", "embedding", "VECTOR", "HNSW", "6",
+                    "TYPE", "FLOAT32", "DIM", str(dim),
+                    "DISTANCE_METRIC", "COSINE",
+                )
+                self._vector_index_ready = True
+            except Exception:
+                self._vector_index_ready = False
+        return self._vector_index_ready
+
+    def _search_vector_index(self, query_embedding, params: Dict[str, Any]) -> Optional[str]:
+        """Run the similarity query server-side via RediSearch KNN"""
+        reply = self._redis_client.execute_command(
+            "FT.SEARCH", "idx:llm", "*=>[KNN 5 @embedding $vec AS score]",
+            "PARAMS", "2", "vec",
+            np.asarray(query_embedding, dtype=np.float32).tobytes(),
+            "SORTBY", "score",
+            "RETURN", "4", "score", "response", "model", "temperature",
+            "DIALECT", "2",
+        )
+        # Reply layout: [total, key1, fields1, key2, fields2, ...] where
+        # each fields list alternates name/value
+        for i in range(2, len(reply), 2):
+            entry = {}
+            fields = iter(reply[i])
+            for name, value in zip(fields, fields):
+                if isinstance(name, bytes):
+                    name = name.decode('utf-8')
+                if isinstance(value, bytes):
+                    value = value.decode('utf-8')
+                entry[name] = value
+            # COSINE distance; similarity is its complement
+            similarity = 1.0 - float(entry.get("score", 1.0))
+            if similarity < self.similarity_threshold:
+                break
+            if (str(params.get("temperature")) == entry.get("temperature") and
+                    (params.get("model") or "") == entry.get("model")):
+                print(f"✓ Cache hit (semantic, {similarity:.2%} similar)")
+                return entry.get("response")
+        return None
+
+    def _search_matrix(self, query_embedding, params: Dict[str, Any]) -> Optional[str]:
+        """Score every remembered embedding in one matrix-vector product"""
+        sims = (self._emb_matrix @ query_embedding) / _QUANT_SCALE
+        # Walk candidates best-first; parameter mismatches are rare, so
+        # this almost always touches Redis exactly once
+        for idx in np.argsort(sims)[::-1]:
+            similarity = float(sims[idx])
+            if similarity < self.similarity_threshold:
+                break
+            cached = self._redis_client.get(self._emb_ids[idx])
+            if not cached:
+                continue
+            cached_data = self._decode_payload(cached)
+            if (params.get("temperature") == cached_data.get("temperature") and
+                    params.get("model") == cached_data.get("model")):
+                print(f"✓ Cache hit (semantic, {similarity:.2%} similar)")
+                return cached_data["response"]
+        return None
+
+    def _scan_redis(self, query_embedding, params: Dict[str, Any]) -> Optional[str]:
+        """Fallback scan over Redis keys, warming the in-process matrix"""
+        # A large count keeps SCAN cursor round-trips low; one MGET then
+        # fetches every payload in a single round-trip instead of a
+        # synchronous GET per key
+        keys = list(self._redis_client.scan_iter("llm:semantic:*", count=1000))
+        if not keys:
+            return None
+        values = self._redis_client.mget(keys)
+
+        # Entries written by earlier processes are mirrored into the
+        # matrix as they are decoded, so the next lookup skips the scan
+        warm = np is not None and not self._emb_ids
+
+        best_match = None
+        best_similarity = 0.0
+
+        for key, cached in zip(keys, values):
+            if not cached:
+                continue
+
+            cached_data = self._decode_payload(cached)
+            cached_embedding = cached_data.get("embedding")
+
+            if not cached_embedding:
+                continue
+
+            # Vectors from a different embedding model live in another
+            # space (and possibly dimension); never compare across them
+            if cached_data.get("emb_model", "all-MiniLM-L6-v2") != self._emb_model_name:
+                continue
+
+            if np is not None:
+                vector = np.asarray(cached_embedding, dtype=np.float32)
+                if cached_data.get("norm") != "l2":
+                    # Entry written before unit-vector storage;
+                    # normalize on read so the dot product is valid
+                    magnitude = np.sqrt(np.vdot(vector, vector))
+                    if not magnitude:
+                        continue
+                    vector = vector / magnitude
+                if warm:
+                    self._remember_embedding(key, vector)
+                similarity = self._dot(query_embedding, vector)
+            else:
+                similarity = self._cosine_similarity(query_embedding, cached_embedding)
+
+            if similarity > best_similarity and similarity >= self.similarity_threshold:
+                # Check if parameters match
+                if (params.get("temperature") == cached_data.get("temperature") and
+                    params.get("model") == cached_data.get("model")):
+                    best_similarity = similarity
+                    best_match = cached_data["response"]
+
+        if best_match:
+            print(f"✓ Cache hit (semantic, {best_similarity:.2%} similar)")
+            return best_match
+
         return None
     
     def set(self, prompt: str, params: Dict[str, Any], response: str, cost: float = 0.0):
@@ -235,31 +591,78 @@ class LLMCache:
                 self._redis_client.setex(
                     f"llm:exact:{cache_key}",
                     self.ttl_seconds,
-                    json.dumps(cache_data)
+                    self._encode_payload(cache_data)
                 )
                 
                 # Store for semantic matching if enabled
                 if self.enable_semantic:
                     embedding = self._get_embedding(prompt)
-                    if embedding:
+                    if (embedding is not None and len(embedding)
+                            and np is not None
+                            and self._ensure_vector_index(len(embedding))):
+                        # Hash entries feed the server-side HNSW index;
+                        # lookups never touch these payloads client-side
+                        semantic_key = f"llm:semantic:{cache_key}"
+                        self._redis_client.hset(semantic_key, mapping={
+                            "embedding": np.asarray(
+                                embedding, dtype=np.float32
+                            ).tobytes(),
+                            "response": response,
+                            "model": params.get("model") or "",
+                            "temperature": str(params.get("temperature")),
+                        })
+                        self._redis_client.expire(semantic_key, self.ttl_seconds)
+                    elif embedding is not None and len(embedding):
                         semantic_data = cache_data.copy()
-                        semantic_data["embedding"] = embedding
+                        # The Redis payload is JSON, so the vector is
+                        # stored as a list either way
+                        semantic_data["embedding"] = (
+                            embedding.tolist() if np is not None else embedding
+                        )
+                        if np is not None:
+                            # Tag unit vectors so lookups skip
+                            # re-normalizing them
+                            semantic_data["norm"] = "l2"
+                        semantic_data["emb_model"] = self._emb_model_name
                         semantic_data["prompt"] = prompt[:200]  # Store snippet for debugging
                         
                         self._redis_client.setex(
                             f"llm:semantic:{cache_key}",
                             self.ttl_seconds,
-                            json.dumps(semantic_data)
+                            self._encode_payload(semantic_data)
                         )
+                        if np is not None:
+                            self._remember_embedding(
+                                f"llm:semantic:{cache_key}", embedding
+                            )
                 
                 print(f"✓ Cached response (${cost:.4f})")
             except Exception as e:
                 print(f"⚠ Cache storage error: {e}")
         else:
-            # In-memory cache
+            # In-memory cache, LRU-bounded with a TinyLFU-style admission
+            # check: at capacity a new entry only displaces the LRU
+            # victim when it has been asked for at least as often, which
+            # keeps popular template prompts resident under churn
+            if (cache_key not in self._memory_cache
+                    and len(self._memory_cache) >= _MEMORY_CACHE_MAX):
+                victim = next(iter(self._memory_cache))
+                if self._freq.get(cache_key, 0) < self._freq.get(victim, 0):
+                    return
+                self._memory_cache.popitem(last=False)
             self._memory_cache[cache_key] = cache_data
+            self._memory_cache.move_to_end(cache_key)
             print(f"✓ Cached response in memory (${cost:.4f})")
     
+    async def aget(self, prompt: str, params: Dict[str, Any]) -> Optional[str]:
+        """Async wrapper for get(); runs the blocking lookup in a thread"""
+        return await asyncio.to_thread(self.get, prompt, params)
+
+    async def aset(self, prompt: str, params: Dict[str, Any],
+                   response: str, cost: float = 0.0) -> None:
+        """Async wrapper for set(); runs the blocking store in a thread"""
+        await asyncio.to_thread(self.set, prompt, params, response, cost)
+
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
         total_requests = self._stats["hits"] + self._stats["misses"]
@@ -278,17 +681,32 @@ class LLMCache:
         """Clear all cached entries"""
         if self._redis_client:
             try:
-                # Clear all LLM cache keys
-                keys = list(self._redis_client.scan_iter("llm:*"))
-                if keys:
-                    self._redis_client.delete(*keys)
-                print(f"✓ Cleared {len(keys)} cache entries")
+                # Stream deletions in batches instead of buffering every
+                # key client-side; UNLINK frees the values off Redis's
+                # main thread so large caches do not stall the server
+                deleted = 0
+                batch = []
+                for key in self._redis_client.scan_iter("llm:*", count=1000):
+                    batch.append(key)
+                    if len(batch) >= 500:
+                        self._redis_client.unlink(*batch)
+                        deleted += len(batch)
+                        batch = []
+                if batch:
+                    self._redis_client.unlink(*batch)
+                    deleted += len(batch)
+                print(f"✓ Cleared {deleted} cache entries")
             except Exception as e:
                 print(f"⚠ Cache clear error: {e}")
         else:
             self._memory_cache.clear()
             print("✓ Cleared in-memory cache")
-        
+
+        self._emb_matrix = None
+        self._emb_ids = []
+        self._freq = {}
+        self._freq_ops = 0
+
         # Reset stats
         self._stats = {
             "hits": 0,
@@ -300,38 +718,67 @@ class LLMCache:
 
 # Global cache instance
 _global_cache = None
+_global_cache_lock = threading.Lock()
 
 
 def get_cache() -> LLMCache:
     """Get or create global cache instance"""
     global _global_cache
     if _global_cache is None:
-        _global_cache = LLMCache()
+        # Double-checked so concurrent first callers build one instance
+        # and steady-state calls never take the lock
+        with _global_cache_lock:
+            if _global_cache is None:
+                _global_cache = LLMCache()
     return _global_cache
 
 
+# Per-1k-token (input, output) prices by model substring, checked in order.
+# NOTE: approximate and subject to change; verify against current pricing.
+_PRICING = (
+    ("gpt-4", (0.03, 0.06)),
+    ("gpt-3.5", (0.001, 0.002)),
+    ("claude", (0.008, 0.024)),
+)
+_DEFAULT_PRICING = (0.01, 0.03)
+
+# tiktoken encoders are expensive to build; keep one per model
+_ENCODER_CACHE: Dict[str, Any] = {}
+
+
+def _count_tokens(text: str, model: str) -> float:
+    """Count tokens with tiktoken when installed, else the chars/4 heuristic"""
+    try:
+        import tiktoken
+    except ImportError:
+        return len(text) / 4
+
+    encoder = _ENCODER_CACHE.get(model)
+    if encoder is None:
+        try:
+            encoder = tiktoken.encoding_for_model(model)
+        except KeyError:
+            encoder = tiktoken.get_encoding("cl100k_base")
+        _ENCODER_CACHE[model] = encoder
+    return len(encoder.encode(text))
+
+
 def estimate_cost(prompt: str, response: str, model: str = "gpt-4") -> float:
     """
     Estimate API cost for a request
-    
-    NOTE: These are approximate estimates and should be verified against current pricing.
-    Rough estimates (subject to change):
-    - GPT-4: $0.03/1k input tokens, $0.06/1k output tokens
-    - GPT-3.5: $0.001/1k input tokens, $0.002/1k output tokens
-    - Claude: $0.008/1k input tokens, $0.024/1k output tokens
+
+    Token counts come from tiktoken when it is installed (the chars/4
+    heuristic is badly off for code and non-English text); otherwise the
+    heuristic is kept as a fallback.
     """
-    # Rough token estimation (1 token ≈ 4 characters)
-    input_tokens = len(prompt) / 4
-    output_tokens = len(response) / 4
-    
-    if "gpt-4" in model.lower():
-        cost = (input_tokens / 1000 * 0.03) + (output_tokens / 1000 * 0.06)
-    elif "gpt-3.5" in model.lower():
-        cost = (input_tokens / 1000 * 0.001) + (output_tokens / 1000 * 0.002)
-    elif "claude" in model.lower():
-        cost = (input_tokens / 1000 * 0.008) + (output_tokens / 1000 * 0.024)
-    else:
-        # Default estimate
-        cost = (input_tokens / 1000 * 0.01) + (output_tokens / 1000 * 0.03)
-    
-    return cost
+    input_tokens = _count_tokens(prompt, model)
+    output_tokens = _count_tokens(response, model)
+
+    model_lower = model.lower()
+    input_price, output_price = _DEFAULT_PRICING
+    for substring, prices in _PRICING:
+        if substring in model_lower:
+            input_price, output_price = prices
+            break
+
+    return (input_tokens / 1000 * input_price) + (output_tokens / 1000 * output_price)
@@ -2,9 +2,15 @@
 LLM configuration and client management
 """
 
+import asyncio
+import hashlib
+import json
 import os
 import logging
-from typing import Optional
+import sqlite3
+import threading
+import time
+from typing import Iterator, List, Optional, Tuple
 from enum import Enum
 
 
@@ -19,9 +25,32 @@ class LLMProvider(Enum):
     OLLAMA = "ollama"
 
 
+# Provider lookup tables; the per-call if/elif chains they replace
+# re-linearized over every provider
+_API_KEY_ENV = {
+    LLMProvider.OPENAI: "OPENAI_API_KEY",
+    LLMProvider.ANTHROPIC: "ANTHROPIC_API_KEY",
+    LLMProvider.GOOGLE: "GOOGLE_API_KEY",
+    LLMProvider.COHERE: "COHERE_API_KEY",
+    LLMProvider.MISTRAL: "MISTRAL_API_KEY",
+    LLMProvider.HUGGINGFACE: "HUGGINGFACE_API_KEY",
+    # Ollama runs locally, no API key needed
+}
+
+_DEFAULT_MODELS = {
+    LLMProvider.OPENAI: "gpt-4",
+    LLMProvider.ANTHROPIC: "claude-3-sonnet-20240229",
+    LLMProvider.GOOGLE: "gemini-pro",
+    LLMProvider.COHERE: "command",
+    LLMProvider.MISTRAL: "mistral-medium",
+    LLMProvider.HUGGINGFACE: "meta-llama/Llama-2-70b-chat-hf",
+    LLMProvider.OLLAMA: "llama2",
+}
+
+
 class LLMConfig:
     """Configuration for LLM integration"""
-    
+
     def __init__(
         self,
         provider: LLMProvider = LLMProvider.OPENAI,
@@ -38,39 +67,31 @@ class LLMConfig:
 
     def _get_api_key(self) -> str:
         """Get API key from environment"""
-        if self.provider == LLMProvider.OPENAI:
-            return os.getenv("OPENAI_API_KEY", "")
-        elif self.provider == LLMProvider.ANTHROPIC:
-            return os.getenv("ANTHROPIC_API_KEY", "")
-        elif self.provider == LLMProvider.GOOGLE:
-            return os.getenv("GOOGLE_API_KEY", "")
-        elif self.provider == LLMProvider.COHERE:
-            return os.getenv("COHERE_API_KEY", "")
-        elif self.provider == LLMProvider.MISTRAL:
-            return os.getenv("MISTRAL_API_KEY", "")
-        elif self.provider == LLMProvider.HUGGINGFACE:
-            return os.getenv("HUGGINGFACE_API_KEY", "")
-        elif self.provider == LLMProvider.OLLAMA:
-            return ""  # Ollama runs locally, no API key needed
-        return ""
+        env_var = _API_KEY_ENV.get(self.provider)
+        if env_var is None:
+            return ""
+        return os.getenv(env_var, "")
 
     def _get_default_model(self) -> str:
         """Get default model for provider"""
-        if self.provider == LLMProvider.OPENAI:
-            return "gpt-4"
-        elif self.provider == LLMProvider.ANTHROPIC:
-            return "claude-3-sonnet-20240229"
-        elif self.provider == LLMProvider.GOOGLE:
-            return "gemini-pro"
-        elif self.provider == LLMProvider.COHERE:
-            return "command"
-        elif self.provider == LLMProvider.MISTRAL:
-            return "mistral-medium"
-        elif self.provider == LLMProvider.HUGGINGFACE:
-            return "meta-llama/Llama-2-70b-chat-hf"
-        elif self.provider == LLMProvider.OLLAMA:
-            return "llama2"
-        return ""
+        return _DEFAULT_MODELS.get(self.provider, "")
+
+
+# Retry policy for transient provider failures
+_MAX_ATTEMPTS = 3
+_BACKOFF_BASE = 0.5
+
+
+def _is_transient(error: Exception) -> bool:
+    """Heuristically classify an SDK error as worth retrying"""
+    name = type(error).__name__.lower()
+    return any(
+        token in name
+        for token in (
+            "timeout", "connection", "ratelimit", "overloaded",
+            "serviceunavailable", "internalserver"
+        )
+    )
 
 
 class LLMClient:
@@ -80,6 +101,19 @@ class LLMClient:
         self.config = config
         self.logger = logging.getLogger(__name__)
         self._client = self._initialize_client()
+        # Async SDK client, created lazily on the first async call
+        self._async_client = None
+        # Per-call dispatch: one hashed lookup instead of walking the
+        # provider if/elif chain on every generation
+        self._generators = {
+            LLMProvider.OPENAI: self._generate_openai,
+            LLMProvider.ANTHROPIC: self._generate_anthropic,
+            LLMProvider.GOOGLE: self._generate_google,
+            LLMProvider.COHERE: self._generate_cohere,
+            LLMProvider.MISTRAL: self._generate_mistral,
+            LLMProvider.HUGGINGFACE: self._generate_huggingface,
+            LLMProvider.OLLAMA: self._generate_ollama,
+        }
 
     def _initialize_client(self):
         """Initialize the appropriate client based on provider"""
@@ -128,37 +162,74 @@ class LLMClient:
                 raise ImportError("Ollama package not installed. Run: pip install ollama")
         return None
 
-    def generate_text(self, prompt: str, system_prompt: Optional[str] = None) -> str:
-        """Generate text using the configured LLM"""
-        if self.config.provider == LLMProvider.OPENAI:
-            return self._generate_openai(prompt, system_prompt)
-        elif self.config.provider == LLMProvider.ANTHROPIC:
-            return self._generate_anthropic(prompt, system_prompt)
-        elif self.config.provider == LLMProvider.GOOGLE:
-            return self._generate_google(prompt, system_prompt)
-        elif self.config.provider == LLMProvider.COHERE:
-            return self._generate_cohere(prompt, system_prompt)
-        elif self.config.provider == LLMProvider.MISTRAL:
-            return self._generate_mistral(prompt, system_prompt)
-        elif self.config.provider == LLMProvider.HUGGINGFACE:
-            return self._generate_huggingface(prompt, system_prompt)
-        elif self.config.provider == LLMProvider.OLLAMA:
-            return self._generate_ollama(prompt, system_prompt)
+    def generate_text(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        json_mode: bool = False
+    ) -> str:
+        """
+        Generate text using the configured LLM
+
+        Transient failures (timeouts, dropped connections, rate limits)
+        are retried with exponential backoff before giving up; other
+        errors propagate immediately.
+
+        With json_mode the provider is asked to emit strict JSON where
+        the API supports it (currently OpenAI's response_format); other
+        providers rely on the prompt's own JSON instructions.
+        """
+        for attempt in range(_MAX_ATTEMPTS):
+            try:
+                return self._generate_once(prompt, system_prompt, json_mode)
+            except Exception as e:
+                if attempt == _MAX_ATTEMPTS - 1 or not _is_transient(e):
+                    raise
+                delay = _BACKOFF_BASE * (2 ** attempt)
+                self.logger.warning(
+                    f"Transient LLM error ({e}); retrying in {delay:.1f}s"
+                )
+                time.sleep(delay)
         return ""
 
-    def _generate_openai(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+    def _generate_once(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        json_mode: bool = False
+    ) -> str:
+        """Dispatch a single generation call to the configured provider"""
+        generator = self._generators.get(self.config.provider)
+        if generator is None:
+            return ""
+        if self.config.provider == LLMProvider.OPENAI:
+            # The only backend with a JSON response mode to forward
+            return generator(prompt, system_prompt, json_mode)
+        return generator(prompt, system_prompt)
+
+    def _generate_openai(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        json_mode: bool = False
+    ) -> str:
         """Generate text using OpenAI"""
         messages = []
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
         messages.append({"role": "user", "content": prompt})
 
+        kwargs = {}
+        if json_mode:
+            kwargs["response_format"] = {"type": "json_object"}
+
         try:
             response = self._client.chat.completions.create(
                 model=self.config.model,
                 messages=messages,
                 temperature=self.config.temperature,
-                max_tokens=self.config.max_tokens
+                max_tokens=self.config.max_tokens,
+                **kwargs
             )
             return response.choices[0].message.content
         except Exception as e:
@@ -268,8 +339,466 @@ class LLMClient:
             self.logger.error(f"Error generating text with Ollama: {e}")
             raise
 
-    async def generate_text_async(self, prompt: str, system_prompt: Optional[str] = None) -> str:
-        """Generate text asynchronously"""
-        # For now, call synchronous version
-        # In production, use async clients
-        return self.generate_text(prompt, system_prompt)
+    def _initialize_async_client(self):
+        """Initialize the provider's async client where the SDK offers one"""
+        if self.config.provider == LLMProvider.OPENAI:
+            from openai import AsyncOpenAI
+            return AsyncOpenAI(api_key=self.config.api_key)
+        if self.config.provider == LLMProvider.ANTHROPIC:
+            from anthropic import AsyncAnthropic
+            return AsyncAnthropic(api_key=self.config.api_key)
+        return None
+
+    async def generate_text_async(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        json_mode: bool = False
+    ) -> str:
+        """
+        Generate text asynchronously
+
+        OpenAI and Anthropic requests go through the SDKs' native async
+        clients, so concurrent generations overlap on the event loop
+        without tying up worker threads. Providers without an async SDK
+        run the blocking call in a thread instead.
+        """
+        if self.config.provider not in (LLMProvider.OPENAI, LLMProvider.ANTHROPIC):
+            return await asyncio.to_thread(
+                self.generate_text, prompt, system_prompt, json_mode
+            )
+
+        if self._async_client is None:
+            self._async_client = self._initialize_async_client()
+
+        for attempt in range(_MAX_ATTEMPTS):
+            try:
+                return await self._agenerate_once(prompt, system_prompt, json_mode)
+            except Exception as e:
+                if attempt == _MAX_ATTEMPTS - 1 or not _is_transient(e):
+                    raise
+                delay = _BACKOFF_BASE * (2 ** attempt)
+                self.logger.warning(
+                    f"Transient LLM error ({e}); retrying in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+        return ""
+
+    async def _agenerate_once(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        json_mode: bool = False
+    ) -> str:
+        """Dispatch one async generation call (OpenAI or Anthropic)"""
+        if self.config.provider == LLMProvider.OPENAI:
+            messages = []
+            if system_prompt:
+                messages.append({"role": "system", "content": system_prompt})
+            messages.append({"role": "user", "content": prompt})
+
+            kwargs = {}
+            if json_mode:
+                kwargs["response_format"] = {"type": "json_object"}
+
+            response = await self._async_client.chat.completions.create(
+                model=self.config.model,
+                messages=messages,
+                temperature=self.config.temperature,
+                max_tokens=self.config.max_tokens,
+                **kwargs
+            )
+            return response.choices[0].message.content
+
+        response = await self._async_client.messages.create(
+            model=self.config.model,
+            max_tokens=self.config.max_tokens,
+            temperature=self.config.temperature,
+            system=system_prompt or "",
+            messages=[{"role": "user", "content": prompt}]
+        )
+        return response.content[0].text
+
+    def generate_text_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None
+    ) -> Iterator[str]:
+        """
+        Generate text, yielding chunks as the provider streams them
+
+        Lets callers overlap downstream work (assembly, disk writes) with
+        generation instead of waiting for the full completion. Supported
+        for OpenAI, Anthropic and Ollama; other providers yield the full
+        response once.
+        """
+        if self.config.provider == LLMProvider.OPENAI:
+            yield from self._stream_openai(prompt, system_prompt)
+        elif self.config.provider == LLMProvider.ANTHROPIC:
+            yield from self._stream_anthropic(prompt, system_prompt)
+        elif self.config.provider == LLMProvider.OLLAMA:
+            yield from self._stream_ollama(prompt, system_prompt)
+        else:
+            yield self.generate_text(prompt, system_prompt)
+
+    def _stream_openai(self, prompt: str, system_prompt: Optional[str] = None) -> Iterator[str]:
+        """Stream text chunks from OpenAI"""
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+
+        try:
+            response = self._client.chat.completions.create(
+                model=self.config.model,
+                messages=messages,
+                temperature=self.config.temperature,
+                max_tokens=self.config.max_tokens,
+                stream=True
+            )
+            for chunk in response:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    yield delta
+        except Exception as e:
+            self.logger.error(f"Error streaming text with OpenAI: {e}")
+            raise
+
+    def _stream_anthropic(self, prompt: str, system_prompt: Optional[str] = None) -> Iterator[str]:
+        """Stream text chunks from Anthropic"""
+        try:
+            with self._client.messages.stream(
+                model=self.config.model,
+                max_tokens=self.config.max_tokens,
+                temperature=self.config.temperature,
+                system=system_prompt or "",
+                messages=[{"role": "user", "content": prompt}]
+            ) as stream:
+                yield from stream.text_stream
+        except Exception as e:
+            self.logger.error(f"Error streaming text with Anthropic: {e}")
+            raise
+
+    def _stream_ollama(self, prompt: str, system_prompt: Optional[str] = None) -> Iterator[str]:
+        """Stream text chunks from Ollama (local models)"""
+        try:
+            messages = []
+            if system_prompt:
+                messages.append({"role": "system", "content": system_prompt})
+            messages.append({"role": "user", "content": prompt})
+
+            for part in self._client.chat(
+                model=self.config.model,
+                messages=messages,
+                stream=True,
+                options={
+                    'temperature': self.config.temperature,
+                    'num_predict': self.config.max_tokens
+                }
+            ):
+                chunk = part['message']['content']
+                if chunk:
+                    yield chunk
+        except Exception as e:
+            self.logger.error(f"Error streaming text with Ollama: {e}")
+            raise
+
+    def submit_batch(
+        self,
+        requests: List[Tuple[Optional[str], str]],
+        poll_interval: float = 30.0
+    ) -> List[str]:
+        """
+        Submit many independent prompts through the provider's batch API
+
+        Batch endpoints trade interactive latency for throughput and cost,
+        which suits offline editing passes that fire one prompt per chapter
+        or per term. Supported for OpenAI and Anthropic; other providers
+        fall back to sequential generate_text calls.
+
+        Args:
+            requests: List of (system_prompt, prompt) tuples
+            poll_interval: Seconds between batch status polls
+
+        Returns:
+            List of response texts in input order ("" for failed entries)
+        """
+        if not requests:
+            return []
+        if self.config.provider == LLMProvider.OPENAI:
+            return self._batch_openai(requests, poll_interval)
+        elif self.config.provider == LLMProvider.ANTHROPIC:
+            return self._batch_anthropic(requests, poll_interval)
+        return [
+            self.generate_text(prompt, system_prompt)
+            for system_prompt, prompt in requests
+        ]
+
+    def _batch_openai(
+        self,
+        requests: List[Tuple[Optional[str], str]],
+        poll_interval: float
+    ) -> List[str]:
+        """Run a batch of prompts through the OpenAI Batch API"""
+        try:
+            lines = []
+            for i, (system_prompt, prompt) in enumerate(requests):
+                messages = []
+                if system_prompt:
+                    messages.append({"role": "system", "content": system_prompt})
+                messages.append({"role": "user", "content": prompt})
+                lines.append(json.dumps({
+                    "custom_id": str(i),
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": self.config.model,
+                        "messages": messages,
+                        "temperature": self.config.temperature,
+                        "max_tokens": self.config.max_tokens
+                    }
+                }))
+
+            input_file = self._client.files.create(
+                file=("batch.jsonl", "\n".join(lines).encode()),
+                purpose="batch"
+            )
+            batch = self._client.batches.create(
+                input_file_id=input_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+            while batch.status not in ("completed", "failed", "expired", "cancelled"):
+                time.sleep(poll_interval)
+                batch = self._client.batches.retrieve(batch.id)
+            if batch.status != "completed":
+                raise RuntimeError(f"Batch finished with status '{batch.status}'")
+
+            responses = [""] * len(requests)
+            output = self._client.files.content(batch.output_file_id)
+            for line in output.text.splitlines():
+                if not line.strip():
+                    continue
+                result = json.loads(line)
+                body = (result.get("response") or {}).get("body") or {}
+                choices = body.get("choices") or []
+                if choices:
+                    responses[int(result["custom_id"])] = choices[0]["message"]["content"]
+            return responses
+        except Exception as e:
+            self.logger.error(f"Error running batch with OpenAI: {e}")
+            raise
+
+    def _batch_anthropic(
+        self,
+        requests: List[Tuple[Optional[str], str]],
+        poll_interval: float
+    ) -> List[str]:
+        """Run a batch of prompts through the Anthropic Message Batches API"""
+        try:
+            batch = self._client.messages.batches.create(
+                requests=[
+                    {
+                        "custom_id": str(i),
+                        "params": {
+                            "model": self.config.model,
+                            "max_tokens": self.config.max_tokens,
+                            "temperature": self.config.temperature,
+                            "system": system_prompt or "",
+                            "messages": [{"role": "user", "content": prompt}]
+                        }
+                    }
+                    for i, (system_prompt, prompt) in enumerate(requests)
+                ]
+            )
+            while batch.processing_status == "in_progress":
+                time.sleep(poll_interval)
+                batch = self._client.messages.batches.retrieve(batch.id)
+
+            responses = [""] * len(requests)
+            for result in self._client.messages.batches.results(batch.id):
+                if result.result.type == "succeeded":
+                    responses[int(result.custom_id)] = result.result.message.content[0].text
+            return responses
+        except Exception as e:
+            self.logger.error(f"Error running batch with Anthropic: {e}")
+            raise
+
+
+class CachedLLMClient:
+    """
+    Disk-backed cache around an LLMClient
+
+    Responses from generate_text are stored in a small SQLite database
+    keyed by a hash of (system prompt, prompt, model), so repeated runs
+    of editing commands skip the network round-trip entirely.
+    """
+
+    def __init__(
+        self,
+        client: LLMClient,
+        cache_dir: str = ".book_creator_cache",
+        max_entries: int = 10000
+    ):
+        self.client = client
+        self.config = client.config
+        self.logger = logging.getLogger(__name__)
+        self.max_entries = max_entries
+        os.makedirs(cache_dir, exist_ok=True)
+        self._db = sqlite3.connect(
+            os.path.join(cache_dir, "responses.db"),
+            check_same_thread=False
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(key TEXT PRIMARY KEY, response TEXT, last_used REAL)"
+        )
+        try:
+            # Upgrade caches created before the LRU column existed
+            self._db.execute("ALTER TABLE responses ADD COLUMN last_used REAL")
+        except sqlite3.OperationalError:
+            pass
+        self._db.commit()
+
+    def _cache_key(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        json_mode: bool = False
+    ) -> str:
+        """Hash prompt, system prompt, model and response mode into a cache key"""
+        key_str = "\x1f".join([system_prompt or "", prompt, self.config.model])
+        if json_mode:
+            key_str += "\x1fjson"
+        return hashlib.sha256(key_str.encode()).hexdigest()
+
+    def _lookup(self, key: str) -> Optional[str]:
+        """Fetch a cached response and refresh its LRU timestamp"""
+        row = self._db.execute(
+            "SELECT response FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row:
+            self._db.execute(
+                "UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key)
+            )
+            self._db.commit()
+            return row[0]
+        return None
+
+    def _store(self, key: str, response: str, commit: bool = True):
+        """Insert a response, evicting least-recently-used rows past the cap"""
+        self._db.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?)",
+            (key, response, time.time())
+        )
+        count = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        if count > self.max_entries:
+            self._db.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY last_used LIMIT ?)",
+                (count - self.max_entries,)
+            )
+        if commit:
+            self._db.commit()
+
+    def generate_text(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        json_mode: bool = False
+    ) -> str:
+        """Generate text, returning a cached response when available"""
+        key = self._cache_key(prompt, system_prompt, json_mode)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+
+        response = self.client.generate_text(prompt, system_prompt, json_mode)
+        if response:
+            self._store(key, response)
+        return response
+
+    async def generate_text_async(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        json_mode: bool = False
+    ) -> str:
+        """Generate text asynchronously, returning a cached response when available"""
+        # SQLite lookups run in a thread; the miss path awaits the
+        # wrapped client's native async call so generations overlap on
+        # the event loop
+        key = self._cache_key(prompt, system_prompt, json_mode)
+        cached = await asyncio.to_thread(self._lookup, key)
+        if cached is not None:
+            return cached
+
+        response = await self.client.generate_text_async(prompt, system_prompt, json_mode)
+        if response:
+            await asyncio.to_thread(self._store, key, response)
+        return response
+
+    def generate_text_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None
+    ) -> Iterator[str]:
+        """Stream text chunks, serving cached responses in one piece"""
+        key = self._cache_key(prompt, system_prompt)
+        cached = self._lookup(key)
+        if cached is not None:
+            yield cached
+            return
+
+        chunks = []
+        for chunk in self.client.generate_text_stream(prompt, system_prompt):
+            chunks.append(chunk)
+            yield chunk
+        response = "".join(chunks)
+        if response:
+            self._store(key, response)
+
+    def submit_batch(
+        self,
+        requests: List[Tuple[Optional[str], str]],
+        poll_interval: float = 30.0
+    ) -> List[str]:
+        """Submit a batch, serving cached entries and only sending the misses"""
+        responses: List[Optional[str]] = [None] * len(requests)
+        misses = []
+        for i, (system_prompt, prompt) in enumerate(requests):
+            key = self._cache_key(prompt, system_prompt)
+            cached = self._lookup(key)
+            if cached is not None:
+                responses[i] = cached
+            else:
+                misses.append((i, key))
+
+        if misses:
+            fresh = self.client.submit_batch(
+                [requests[i] for i, _ in misses], poll_interval
+            )
+            for (i, key), response in zip(misses, fresh):
+                responses[i] = response
+                if response:
+                    self._store(key, response, commit=False)
+            self._db.commit()
+
+        return [response or "" for response in responses]
+
+
+# Process-wide default client, shared by generators constructed without an
+# explicit llm_client so they reuse one SDK client (and its TCP/TLS
+# connection pool) instead of opening fresh sessions per instance
+_DEFAULT_CLIENT: Optional[LLMClient] = None
+_DEFAULT_CLIENT_LOCK = threading.Lock()
+
+
+def get_default_client() -> LLMClient:
+    """Return the shared default LLMClient, creating it on first use"""
+    global _DEFAULT_CLIENT
+    if _DEFAULT_CLIENT is None:
+        with _DEFAULT_CLIENT_LOCK:
+            if _DEFAULT_CLIENT is None:
+                _DEFAULT_CLIENT = LLMClient(LLMConfig())
+    return _DEFAULT_CLIENT
@@ -0,0 +1,70 @@
+"""
+Parsing utilities for sectioned LLM responses.
+
+The editors prompt for responses shaped like
+
+    HEADER:
+    - item
+    - item
+    SCORE: 8
+
+and previously each parser walked the response line by line in Python.
+A single compiled regex drives the section state machine in one
+C-level scan instead.
+"""
+
+import re
+from typing import Any, Dict, Optional
+
+
+# One pass picks up both "HEADER: rest" lines and "- bullet" lines
+_LINE_RE = re.compile(
+    r"^[ \t]*(?:(?P<header>[A-Z][A-Z_]*):[ \t]*(?P<rest>.*?)|-[ \t]*(?P<bullet>.+?))[ \t\r]*$",
+    re.MULTILINE
+)
+
+
+def parse_sections(
+    response: str,
+    header_map: Dict[str, str],
+    score_map: Optional[Dict[str, str]] = None
+) -> Dict[str, Any]:
+    """
+    Collect bulleted items under known headers from an LLM response.
+
+    Args:
+        response: The raw response text
+        header_map: Maps response headers (e.g. "ISSUES") to result
+            buckets (e.g. "issues") that accumulate bullet items
+        score_map: Maps numeric headers (e.g. "SCORE") to result keys;
+            values are parsed as ints (taking the numerator of "8/10"),
+            defaulting to 0
+
+    Returns:
+        Dictionary with a list per header bucket and an int per score key
+    """
+    result: Dict[str, Any] = {bucket: [] for bucket in header_map.values()}
+    if score_map:
+        for key in score_map.values():
+            result[key] = 0
+
+    current = None
+    for match in _LINE_RE.finditer(response):
+        header = match.group("header")
+        if header:
+            if score_map and header in score_map:
+                current = None
+                try:
+                    result[score_map[header]] = int(
+                        match.group("rest").strip().split('/')[0]
+                    )
+                except (ValueError, IndexError):
+                    pass
+            else:
+                current = header_map.get(header)
+        elif current:
+            item = match.group("bullet").strip()
+            if item:
+                result[current].append(item)
+
+    return result
@@ -0,0 +1,31 @@
+"""
+Shared fixtures and helpers for the test suite
+"""
+
+import functools
+import os
+import shutil
+
+import pytest
+
+from book_creator.formatters.pandoc_pdf_formatter import PandocPDFFormatter
+
+
+@functools.lru_cache(maxsize=1)
+def check_pandoc_available():
+    """Check if Pandoc is available; probed once per test run"""
+    # A PATH stat instead of forking `pandoc --version`; the tests only
+    # need to know the binary exists
+    return shutil.which('pandoc') is not None
+
+
+@pytest.fixture(scope="session")
+def formatter():
+    """One PandocPDFFormatter shared by every test that just uses it"""
+    # Test PDFs are discarded right after size/header asserts, so skip
+    # image compression in the DVI->PDF step; setdefault keeps any
+    # explicit override from the environment
+    os.environ.setdefault(
+        'BOOK_CREATOR_PDF_ENGINE_OPTS', "-output-driver='xdvipdfmx -z0'"
+    )
+    return PandocPDFFormatter()
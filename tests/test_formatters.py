@@ -2,8 +2,9 @@
 Tests for formatters
 """
 
-import tempfile
-import os
+import re
+
+import pytest
 
 from book_creator.models.book import Book, Chapter, Section
 from book_creator.formatters.html_formatter import HTMLFormatter
@@ -11,7 +12,7 @@ from book_creator.formatters.markdown_formatter import MarkdownFormatter
 
 
 def create_test_book():
-    """Create a test book for formatter tests"""
+    """Build a fresh test book; use the test_book fixture for read-only tests"""
     book = Book(
         title="Test Book",
         author="Test Author",
@@ -32,82 +33,56 @@ def create_test_book():
     return book
 
 
-def test_html_formatter():
-    """Test HTML formatter"""
-    book = create_test_book()
-    formatter = HTMLFormatter()
-    
-    with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.html') as f:
-        temp_file = f.name
-    
-    try:
-        formatter.format(book, temp_file)
-        
-        # Check file exists and has content
-        assert os.path.exists(temp_file)
-        with open(temp_file, 'r') as f:
-            content = f.read()
-            assert 'Test Book' in content
-            assert 'Test Author' in content
-            assert 'Test Chapter' in content
-            assert 'Test Section' in content
-    finally:
-        if os.path.exists(temp_file):
-            os.remove(temp_file)
-
-
-def test_markdown_formatter():
-    """Test Markdown formatter"""
-    book = create_test_book()
-    formatter = MarkdownFormatter()
-    
-    with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.md') as f:
-        temp_file = f.name
-    
-    try:
-        formatter.format(book, temp_file)
-        
-        # Check file exists and has content
-        assert os.path.exists(temp_file)
-        with open(temp_file, 'r') as f:
-            content = f.read()
-            assert '# Test Book' in content
-            assert '**Author:** Test Author' in content
-            assert 'Chapter 1: Test Chapter' in content
-            assert '### Test Section' in content
-            assert '```python' in content
-    finally:
-        if os.path.exists(temp_file):
-            os.remove(temp_file)
-
-
-def test_html_formatter_with_exercises():
-    """Test HTML formatter with exercises"""
+@pytest.fixture(scope="module")
+def test_book():
+    """One shared book for the read-only formatter tests"""
+    return create_test_book()
+
+
+# Formatter classes with the substrings their output must contain
+FORMATTER_EXPECTATIONS = [
+    (HTMLFormatter, ['Test Book', 'Test Author', 'Test Chapter', 'Test Section']),
+    (MarkdownFormatter, ['# Test Book', '**Author:** Test Author',
+                         'Chapter 1: Test Chapter', '### Test Section', '```python']),
+]
+
+# One alternation per formatter, compiled at import: a single scan of
+# the rendered document finds every expected substring
+_EXPECTED_PATTERNS = {
+    formatter_cls: re.compile("|".join(map(re.escape, needles)))
+    for formatter_cls, needles in FORMATTER_EXPECTATIONS
+}
+
+
+@pytest.mark.parametrize(
+    "formatter_cls, expected", FORMATTER_EXPECTATIONS, ids=["html", "markdown"]
+)
+def test_formatter_output(test_book, formatter_cls, expected):
+    """Test that each formatter renders the book's key elements"""
+    content = formatter_cls().format_to_str(test_book)
+
+    found = set(_EXPECTED_PATTERNS[formatter_cls].findall(content))
+    assert found == set(expected)
+
+
+def test_html_formatter_with_exercises(tmp_path):
+    """Test HTML formatter with exercises, end-to-end through a file"""
     book = create_test_book()
     book.chapters[0].sections[0].add_exercise(
         "What is 2+2?",
         "4",
         ["Think about math", "It's simple"]
     )
-    
-    formatter = HTMLFormatter()
-    
-    with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.html') as f:
-        temp_file = f.name
-    
-    try:
-        formatter.format(book, temp_file)
-        
-        with open(temp_file, 'r') as f:
-            content = f.read()
-            assert 'What is 2+2?' in content
-            assert 'exercise' in content.lower()
-    finally:
-        if os.path.exists(temp_file):
-            os.remove(temp_file)
-
-
-def test_markdown_formatter_with_code():
+
+    temp_file = tmp_path / "book.html"
+    HTMLFormatter().format(book, str(temp_file))
+
+    content = temp_file.read_text()
+    assert 'What is 2+2?' in content
+    assert 'exercise' in content.lower()
+
+
+def test_markdown_formatter_with_code(tmp_path):
     """Test Markdown formatter with code examples"""
     book = Book(title="Code Book", author="Author")
     chapter = Chapter(title="Chapter 1", number=1)
@@ -119,20 +94,11 @@ def test_markdown_formatter_with_code():
     )
     chapter.add_section(section)
     book.add_chapter(chapter)
-    
-    formatter = MarkdownFormatter()
-    
-    with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.md') as f:
-        temp_file = f.name
-    
-    try:
-        formatter.format(book, temp_file)
-        
-        with open(temp_file, 'r') as f:
-            content = f.read()
-            assert '```python' in content
-            assert 'def hello():' in content
-            assert "print('Hello World')" in content
-    finally:
-        if os.path.exists(temp_file):
-            os.remove(temp_file)
+
+    temp_file = tmp_path / "book.md"
+    MarkdownFormatter().format(book, str(temp_file))
+
+    content = temp_file.read_text()
+    assert '```python' in content
+    assert 'def hello():' in content
+    assert "print('Hello World')" in content
@@ -0,0 +1,142 @@
+"""
+Tests for the pure-Python parts of the Pandoc formatter
+
+These exercise Markdown validation and formatter metadata only, so they
+run everywhere — no Pandoc binary required.
+"""
+
+import pytest
+
+from book_creator.models.book import Book
+from book_creator.formatters.pandoc_pdf_formatter import PandocPDFFormatter
+
+
+def test_pandoc_formatter_initialization():
+    """Test PandocPDFFormatter initialization"""
+    formatter = PandocPDFFormatter()
+    assert formatter.pandoc_path == "pandoc"
+
+
+def test_pandoc_not_found(tmp_path):
+    """Test error when Pandoc is not found at format time"""
+    # Construction is lazy; the missing binary surfaces on format()
+    bad_formatter = PandocPDFFormatter(pandoc_path="/nonexistent/pandoc")
+    book = Book(title="Test", author="Test")
+
+    with pytest.raises(RuntimeError, match="Pandoc is not installed"):
+        bad_formatter.format(book, str(tmp_path / "out.pdf"))
+
+
+def test_markdown_validation_valid(formatter):
+    """Test Markdown validation with valid content"""
+    valid_markdown = """# Heading 1
+
+## Heading 2
+
+This is a paragraph with **bold** and *italic* text.
+
+### Code Example
+
+```python
+def hello():
+    print("Hello, World!")
+```
+
+- List item 1
+- List item 2
+
+[Link text](https://example.com)
+"""
+
+    is_valid, errors = formatter.validate_markdown(valid_markdown)
+    assert is_valid
+    assert len(errors) == 0
+
+
+def test_markdown_validation_unbalanced_code_fences(formatter):
+    """Test detection of unbalanced code fences"""
+    invalid_markdown = """# Test
+
+```python
+def test():
+    pass
+# Missing closing fence
+"""
+
+    is_valid, errors = formatter.validate_markdown(invalid_markdown)
+    assert not is_valid
+    assert any("code fences" in err.lower() for err in errors)
+
+
+def test_markdown_validation_invalid_heading(formatter):
+    """Test detection of invalid heading syntax"""
+    invalid_markdown = """#Invalid Heading
+This should have a space after #
+"""
+
+    is_valid, errors = formatter.validate_markdown(invalid_markdown)
+    assert not is_valid
+    assert any("heading" in err.lower() for err in errors)
+
+
+def test_markdown_validation_invalid_list(formatter):
+    """Test detection of invalid list syntax"""
+    invalid_markdown = """# Test
+
+-Item without space
+* Another item
+"""
+
+    is_valid, errors = formatter.validate_markdown(invalid_markdown)
+    assert not is_valid
+    assert any("list" in err.lower() for err in errors)
+
+
+def test_markdown_validation_with_multiple_code_blocks(formatter):
+    """Test validation with multiple code blocks"""
+    markdown = """# Test
+
+First code block:
+
+```python
+def test1():
+    pass
+```
+
+Second code block:
+
+```javascript
+function test2() {
+    return true;
+}
+```
+
+Done.
+"""
+
+    is_valid, errors = formatter.validate_markdown(markdown)
+    assert is_valid
+
+
+def test_markdown_validation_with_inline_code(formatter):
+    """Test validation doesn't break with inline code"""
+    markdown = """# Test
+
+Use `inline code` like this.
+
+More text with `another inline` example.
+"""
+
+    is_valid, errors = formatter.validate_markdown(markdown)
+    assert is_valid
+
+
+def test_get_supported_themes(formatter):
+    """Test getting list of supported themes"""
+    themes = formatter.get_supported_themes()
+
+    assert isinstance(themes, list)
+    assert len(themes) > 0
+    assert 'tango' in themes
+    assert 'pygments' in themes
+    assert 'kate' in themes